@@ -0,0 +1,173 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [ALT Landmarks]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: implement ALT (A*, Landmarks, Triangle inequality) for static maps queried many times,
+        pick a few landmark cells, store the cost from each landmark to every cell once, then
+        answer queries with A* using the lower bounds those tables give
+
+--> for a landmark L the triangle inequality gives cost(v, g) >= |cost(L, v) - cost(L, g)|, the
+    heuristic is the largest of these bounds and the octile distance, so it stays admissible and
+    consistent and paths are still lowest cost
+--> landmarks are picked farthest first: each new one is the cell farthest from the ones already
+    picked, so they end up in the dead ends and corners a maze path has to go around
+--> tables hold costs in 1 / COST_SCALE units as uint16 when the map allows, uint32 otherwise,
+    the largest value of the type marks cells a landmark cannot reach
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import heapq
+import numpy as np
+from Dijk_cache import mapFingerprint
+from Dijk_search import COST_SCALE, SearchResult, backtrackIds, buildMoveMasks, buildMoveTable, checkState, toCellId, toState
+from Dijk_wavefront import wavefrontDistances
+
+## ------------------------------------------------------------------------------------------
+#                                     Landmark Map Class
+## ------------------------------------------------------------------------------------------
+
+class LandmarkMap:
+
+    '''
+    Attributes:
+        occGrid: map the tables were built for
+        connectivity: 8 or 4, same meaning as in findPath
+        landmarks: cell ids of the landmarks
+        tables: (landmarks, cells) cost from each landmark to every cell in 1 / COST_SCALE units,
+                np.iinfo(tables.dtype).max where the landmark cannot reach the cell
+    '''
+
+    def __init__(self, occGrid, numLandmarks = 16, connectivity = 8, landmarks = None, tables = None):
+        self.occGrid = np.ascontiguousarray(occGrid, dtype = bool)
+        self.mapHeight, self.mapWidth = self.occGrid.shape
+        self.connectivity = connectivity
+        self.moveMasks = buildMoveMasks(self.occGrid, connectivity)   # also fails early on a bad connectivity
+        if tables is None:
+            landmarks, tables = self.buildTables(numLandmarks)
+        self.landmarks = list(landmarks)
+        self.tables = np.ascontiguousarray(tables)
+
+    def __repr__(self):
+        return(f' landmarks: {len(self.landmarks)}, tables: {self.tables.dtype} {self.tables.nbytes / 2**20:.1f} MiB ')
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Precomputation
+    ## --------------------------------------------------------------------------------------
+
+    def buildTables(self, numLandmarks): # farthest first landmarks and their cost tables, one wavefront per landmark
+
+        free = np.flatnonzero(~self.occGrid.reshape(-1))
+        if free.size == 0:
+            raise ValueError("Map has no free cell to place a landmark on")
+        # landmarks cover the part of the map connected to the free cell nearest its centre
+        centre = free[np.argmin((free % self.mapWidth - self.mapWidth / 2) ** 2 + (free // self.mapWidth - self.mapHeight / 2) ** 2)]
+        nearest = wavefrontDistances(self.occGrid, [toState(int(centre), self.mapWidth)], self.connectivity, self.moveMasks).reshape(-1)
+        reachable = np.flatnonzero(np.isfinite(nearest))
+        landmarks, tables = [], []
+        for _ in range(min(numLandmarks, reachable.size)):
+            # next landmark --> the reachable cell farthest from every landmark picked so far
+            cellId = int(reachable[np.argmax(nearest[reachable])])
+            if landmarks and nearest[cellId] == 0:   # every reachable cell is a landmark already
+                break
+            costs = wavefrontDistances(self.occGrid, [toState(cellId, self.mapWidth)], self.connectivity, self.moveMasks).reshape(-1)
+            landmarks.append(cellId)
+            tables.append(costs)
+            nearest = costs if len(landmarks) == 1 else np.minimum(nearest, costs)
+
+        tables = np.array(tables)
+        largest = tables[:, reachable].max() * COST_SCALE
+        dtype = np.uint16 if largest < np.iinfo(np.uint16).max else np.uint32
+        unreached = np.iinfo(dtype).max
+        return(landmarks, np.where(np.isfinite(tables), np.rint(tables * COST_SCALE), unreached).astype(dtype))
+
+    def save(self, fileName): # store the tables so a restart does not rebuild them
+        with open(fileName, 'wb') as file:   # through a file, np.savez_compressed would add .npz to a bare name
+            np.savez_compressed(file, fingerprint = np.array(mapFingerprint(self.occGrid)), connectivity = np.array(self.connectivity),
+                                landmarks = np.array(self.landmarks, dtype = np.int64), tables = self.tables)
+
+    @classmethod
+    def load(cls, fileName, occGrid): # tables saved for this exact map, ValueError for any other map
+        with np.load(fileName) as data:
+            if str(data['fingerprint']) != mapFingerprint(occGrid):
+                raise ValueError(f"{fileName} was built for a different map")
+            return(cls(occGrid, connectivity = int(data['connectivity']), landmarks = data['landmarks'].tolist(), tables = data['tables']))
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Query Functions
+    ## --------------------------------------------------------------------------------------
+
+    def findPath(self, s, g, observer = None, numActive = 4):
+
+        '''
+        Lowest cost path from s to g, A* with the landmark heuristic.
+        numActive landmarks with the best bound between s and g are used for the whole query,
+        fewer means cheaper heuristic calls, more means tighter bounds.
+        '''
+
+        checkState(s, self.occGrid, "Start")
+        checkState(g, self.occGrid, "Goal")
+        mapWidth = self.mapWidth
+        moveTable = [(bit, delta, round(step * COST_SCALE)) for bit, delta, step in buildMoveTable(mapWidth, self.connectivity)]
+        legalMoves = memoryview(self.moveMasks.reshape(-1))
+        startId, goalId = toCellId(s, mapWidth), toCellId(g, mapWidth)
+
+        # a landmark that reaches exactly one of start and goal --> they are not connected
+        unreached = np.iinfo(self.tables.dtype).max
+        startCosts, goalCosts = self.tables[:, startId].astype(np.int64), self.tables[:, goalId].astype(np.int64)
+        if np.any((startCosts == unreached) != (goalCosts == unreached)):
+            return(SearchResult([], float('inf'), 0, 0))
+        active = np.argsort(-np.abs(startCosts - goalCosts), kind = 'stable')[:numActive]
+        bounds = [(memoryview(self.tables[k]), int(goalCosts[k])) for k in active]
+
+        goalX, goalY = goalId % mapWidth, goalId // mapWidth
+        straight = round(COST_SCALE)
+        diagonalSaving = round(1.4 * COST_SCALE) - 2 * straight if self.connectivity == 8 else 0
+
+        def heuristic(cellId): # octile distance or the best landmark bound, whichever is larger
+            dx, dy = abs(cellId % mapWidth - goalX), abs(cellId // mapWidth - goalY)
+            h = straight * (dx + dy) + diagonalSaving * min(dx, dy)
+            for table, goalCost in bounds:
+                bound = abs(table[cellId] - goalCost)
+                if bound > h:
+                    h = bound
+            return(h)
+
+        c2c = {startId: 0}   # cost to come in 1 / COST_SCALE units of every discovered cell
+        parent = {startId: -1}
+        closed = set()
+        queue = [(heuristic(startId), 0, startId)]   # heap of (f, order, cellId), equal f are explored last in first out
+        order = 0
+
+        while queue != []:
+            current = heapq.heappop(queue)[2]
+            if current in closed:   # stale entry, cell was already explored at a lower cost
+                continue
+            closed.add(current)
+            if observer is not None:
+                observer(toState(current, mapWidth))
+
+            # Case 1 --> Goal Reached
+            if current == goalId:
+                path = [toState(cellId, mapWidth) for cellId in backtrackIds(parent, current)]
+                return(SearchResult(path, c2c[current] / COST_SCALE, len(closed), len(c2c)))
+
+            # Case 2: goal not reached, relax every legal move of the current cell
+            cost, mask = c2c[current], legalMoves[current]
+            for bit, delta, step in moveTable:
+                if not mask & bit:
+                    continue
+                child = current + delta
+                childCost = cost + step
+                if child not in closed and childCost < c2c.get(child, float('inf')):
+                    c2c[child] = childCost
+                    parent[child] = current
+                    order -= 1
+                    heapq.heappush(queue, (childCost + heuristic(child), order, child))
+
+        # queue exhausted --> goal cannot be reached from start
+        return(SearchResult([], float('inf'), len(closed), len(c2c)))
@@ -0,0 +1,96 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Batch Queries]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: solve many (start, goal) queries on one map in parallel across cores
+
+--> the map and its move masks are copied once into shared memory, workers attach to it by name
+    instead of receiving a pickled copy of the map with every task
+--> a map memory mapped from a .npy file (Dijk_mapFile.loadMap) is not copied, workers map the same file
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from Dijk_mapFile import getMapFile
+from Dijk_search import buildMoveMasks, checkState, findPath
+
+# map shared by the parent, attached once per worker process
+workerMap = {}
+
+## ------------------------------------------------------------------------------------------
+#                                     Batch Function
+## ------------------------------------------------------------------------------------------
+
+def solveBatch(occGrid, queries, workers = None, connectivity = 8, chunkSize = None, method = 'dijkstra'):
+
+    '''
+    Find the lowest cost path for every (start, goal) pair in queries on occGrid.
+    Returns a list of SearchResult in the same order as queries.
+    workers is the number of processes, os.cpu_count() when None, 1 solves in this process.
+    method is passed on to findPath, 'dijkstra' or 'astar'.
+    '''
+
+    queries = [(list(s), list(g)) for s, g in queries]
+    for s, g in queries:   # fail before any work is handed out
+        checkState(s, occGrid, "Start")
+        checkState(g, occGrid, "Goal")
+
+    mapFile = getMapFile(occGrid)   # checked before the conversion below drops the file mapping
+    occGrid = np.ascontiguousarray(occGrid, dtype = bool)
+    moveMasks = buildMoveMasks(occGrid, connectivity)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(queries) <= 1:
+        return([findPath(occGrid, s, g, connectivity = connectivity, moveMasks = moveMasks, method = method) for s, g in queries])
+
+    if chunkSize is None:
+        chunkSize = max(1, len(queries) // (workers * 4))
+    chunks = [queries[i:i + chunkSize] for i in range(0, len(queries), chunkSize)]
+
+    # one block holds the move masks followed by the grid (unless workers map its file), one byte per cell
+    numLayers = 1 if mapFile is not None else 2
+    memory = SharedMemory(create = True, size = numLayers * occGrid.size)
+    try:
+        shared = np.ndarray((numLayers,) + occGrid.shape, dtype = np.uint8, buffer = memory.buf)
+        shared[0] = moveMasks
+        if mapFile is None:
+            shared[1] = occGrid
+        del shared   # release the view so the block can be closed
+
+        with ProcessPoolExecutor(max_workers = workers, initializer = attachMap, initargs = (memory.name, occGrid.shape, connectivity, method, mapFile)) as pool:
+            results = []
+            for chunkResults in pool.map(solveChunk, chunks):
+                results.extend(chunkResults)
+        return(results)
+    finally:
+        memory.close()
+        memory.unlink()
+
+## ------------------------------------------------------------------------------------------
+#                                  Worker Functions
+## ------------------------------------------------------------------------------------------
+
+def attachMap(name, shape, connectivity, method, mapFile = None): # pool initializer --> attach to the shared map once per worker, the parent unlinks it
+    memory = SharedMemory(name = name)
+    numLayers = 1 if mapFile is not None else 2
+    shared = np.ndarray((numLayers,) + tuple(shape), dtype = np.uint8, buffer = memory.buf)
+    workerMap['memory'] = memory
+    workerMap['moveMasks'] = shared[0]
+    if mapFile is not None:
+        fileName, offset = mapFile
+        workerMap['occGrid'] = np.memmap(fileName, dtype = np.bool_, mode = 'r', offset = offset, shape = tuple(shape))
+    else:
+        workerMap['occGrid'] = shared[1].view(bool)
+    workerMap['connectivity'] = connectivity
+    workerMap['method'] = method
+
+def solveChunk(chunk): # solve a list of (start, goal) pairs on the attached map
+    occGrid, moveMasks = workerMap['occGrid'], workerMap['moveMasks']
+    return([findPath(occGrid, s, g, connectivity = workerMap['connectivity'], moveMasks = moveMasks, method = workerMap['method']) for s, g in chunk])
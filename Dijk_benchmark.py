@@ -0,0 +1,130 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Benchmarks]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: time every search engine headlessly on the maps of the three scripts and on seeded
+        synthetic maps, so changes can be compared before and after
+
+--> wall time is the best of --repeat runs of findPath alone, no pygame, no drawing, no sleeps
+--> peak memory is measured in a separate run under tracemalloc, so it does not slow the timed runs
+--> usage: python Dijk_benchmark.py --sizes 100 1000 5000 --engines dijkstra astar --json out.json
+           python Dijk_benchmark.py --baseline out.json   (flags rows slower than the saved run)
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+import numpy as np
+from Dijk_maps import buildEmptyMap, buildMazeMap, buildObstacleMap, mazeMap, randomMap
+from Dijk_search import findPath
+
+# engine name --> findPath keyword arguments
+ENGINES = {
+    'dijkstra': {'method': 'dijkstra'},
+    'dijkstra-node': {'method': 'dijkstra', 'storage': 'node'},
+    'astar': {'method': 'astar'},
+    'bidirectional': {'method': 'bidirectional'},
+    'jps': {'method': 'jps'},
+    'bucket': {'method': 'bucket'},
+}
+
+## ------------------------------------------------------------------------------------------
+#                                     Benchmark Functions
+## ------------------------------------------------------------------------------------------
+
+def buildScenarios(sizes, seed = 0): # (name, occGrid, start, goal) for the script maps and each synthetic size
+    scenarios = [
+        ('empty', buildEmptyMap(), [1, 1], [10, 6]),
+        ('obstacle1', buildObstacleMap(1), [10, 1], [2, 1]),
+        ('obstacle2', buildObstacleMap(2), [10, 1], [2, 1]),
+        ('maze', buildMazeMap(), [3, 6], [16, 1]),
+    ]
+    for size in sizes:
+        scenarios.append((f'random-{size}', randomMap(size, size, seed = seed), [1, 1], [size, size]))
+        scenarios.append((f'maze-{size}', mazeMap(size, size, seed = seed), [1, 1], [size, size]))
+    return(scenarios)
+
+def runBenchmark(scenarios, engines, repeat = 5):
+
+    '''
+    Time every engine on every scenario.
+    Returns one dict per (scenario, engine) with cost, nodes expanded, best wall time,
+    expansions per second and peak traced memory.
+    '''
+
+    records = []
+    for name, occGrid, s, g in scenarios:
+        for engine in engines:
+            wallTime = float('inf')
+            for _ in range(repeat):
+                begin = time.perf_counter()
+                result = findPath(occGrid, s, g, **ENGINES[engine])
+                wallTime = min(wallTime, time.perf_counter() - begin)
+
+            tracemalloc.start()
+            findPath(occGrid, s, g, **ENGINES[engine])
+            peakMemory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            records.append({'scenario': name, 'engine': engine, 'cells': int(occGrid.size), 'cost': round(result.cost, 6),
+                            'nodesExpanded': result.nodesExpanded, 'wallTime': wallTime,
+                            'expansionsPerSec': result.nodesExpanded / wallTime if wallTime > 0 else 0.0,
+                            'peakMemory': peakMemory})
+    return(records)
+
+def printRecords(records, baseline = None, tolerance = 1.25):
+    previous = {(record['scenario'], record['engine']): record for record in baseline or []}
+    print(f"{'scenario':<16}{'engine':<15}{'cost':>12}{'expanded':>11}{'wall ms':>11}{'exp/sec':>12}{'peak MiB':>10}")
+    for record in records:
+        line = (f"{record['scenario']:<16}{record['engine']:<15}{record['cost']:>12.3f}{record['nodesExpanded']:>11}"
+                f"{record['wallTime'] * 1000:>11.3f}{record['expansionsPerSec']:>12.0f}{record['peakMemory'] / 2**20:>10.2f}")
+        old = previous.get((record['scenario'], record['engine']))
+        if old is not None:
+            ratio = record['wallTime'] / old['wallTime']
+            line += f"  x{ratio:.2f}" + ("  SLOWER" if ratio > tolerance else "")
+            if old['cost'] != record['cost']:
+                line += "  COST CHANGED"
+        print(line)
+
+    # every engine returns a lowest cost path, so costs must agree within a scenario
+    for name in dict.fromkeys(record['scenario'] for record in records):
+        costs = {record['engine']: record['cost'] for record in records if record['scenario'] == name}
+        if len(set(costs.values())) > 1:
+            print(f"Cost mismatch on {name}: {costs}")
+
+## ------------------------------------------------------------------------------------------
+#                                       Main Function
+## ------------------------------------------------------------------------------------------
+
+if __name__== "__main__":
+
+    parser = argparse.ArgumentParser(description = "Benchmark the search engines headlessly")
+    parser.add_argument('--sizes', type = int, nargs = '*', default = [100, 500, 1000], help = "side lengths of the synthetic maps, e.g. 100 1000 5000")
+    parser.add_argument('--engines', nargs = '*', default = list(ENGINES), choices = list(ENGINES))
+    parser.add_argument('--repeat', type = int, default = 5, help = "timed runs per row, the best one is reported")
+    parser.add_argument('--seed', type = int, default = 0, help = "seed of the synthetic maps")
+    parser.add_argument('--json', help = "write the results and the environment to this file")
+    parser.add_argument('--baseline', help = "results file of an earlier run to compare against")
+    parser.add_argument('--tolerance', type = float, default = 1.25, help = "wall time ratio above which a row is flagged")
+    args = parser.parse_args()
+
+    records = runBenchmark(buildScenarios(args.sizes, args.seed), args.engines, args.repeat)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['records']
+    printRecords(records, baseline, args.tolerance)
+
+    if args.json:
+        environment = {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+                       'processor': platform.processor(), 'seed': args.seed, 'repeat': args.repeat}
+        with open(args.json, 'w') as file:
+            json.dump({'environment': environment, 'records': records}, file, indent = 2)
@@ -0,0 +1,104 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Path Cache]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: keep recent search results so repeated queries on a static map skip the search
+
+--> results are keyed on a content hash of the map plus (start, goal), oldest entries are evicted first
+--> every step costs the same both ways, so a cached (g, s) result answers (s, g) with the path reversed
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from Dijk_search import SearchResult, findPath
+
+## ------------------------------------------------------------------------------------------
+#                                     Path Cache Class
+## ------------------------------------------------------------------------------------------
+
+class PathCache:
+
+    '''
+    Attributes:
+        maxSize: most results kept before the least recently used one is evicted
+        hits: queries answered from the cache, reversed queries included
+        misses: queries that had to run a search
+        evictions: results dropped to stay within maxSize
+    '''
+
+    def __init__(self, maxSize = 1024):
+        if maxSize < 1:
+            raise ValueError(f"maxSize must be at least 1, not {maxSize}")
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.results = OrderedDict()   # (fingerprint, connectivity, method, start, goal) --> SearchResult, oldest first
+
+    def __repr__(self):
+        return(f' size: {len(self.results)}/{self.maxSize}, hits: {self.hits}, misses: {self.misses}, evictions: {self.evictions} ')
+
+    def __len__(self):
+        return(len(self.results))
+
+    def findPath(self, occGrid, s, g, *, connectivity = 8, fingerprint = None, method = 'dijkstra'):
+
+        '''
+        Same result as Dijk_search.findPath(occGrid, s, g, connectivity = ..., method = ...), served from
+        the cache when the map and endpoints match. Options after g are keyword only, so they cannot be
+        mixed up with the observer Dijk_search.findPath takes in that place (a cache cannot replay it).
+        Pass fingerprint = mapFingerprint(occGrid) to skip hashing the map on every query.
+        '''
+
+        if fingerprint is None:
+            fingerprint = mapFingerprint(occGrid)
+        key = (fingerprint, connectivity, method, tuple(s), tuple(g))
+
+        # Case 1 --> same query seen before
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return(copyResult(self.results[key], reverse = False))
+
+        # Case 2 --> reversed query seen before
+        reverseKey = (fingerprint, connectivity, method, tuple(g), tuple(s))
+        if reverseKey in self.results:
+            self.hits += 1
+            self.results.move_to_end(reverseKey)
+            return(copyResult(self.results[reverseKey], reverse = True))
+
+        # Case 3 --> search and remember the result
+        self.misses += 1
+        result = findPath(occGrid, s, g, connectivity = connectivity, method = method)
+        self.results[key] = copyResult(result, reverse = False)
+        if len(self.results) > self.maxSize:
+            self.results.popitem(last = False)
+            self.evictions += 1
+        return(result)
+
+    def clear(self): # drop every result, counters are kept
+        self.results.clear()
+
+## ------------------------------------------------------------------------------------------
+#                                  Helper Functions
+## ------------------------------------------------------------------------------------------
+
+def mapFingerprint(occGrid): # content hash of the occupancy grid, equal maps give equal fingerprints
+    occGrid = np.ascontiguousarray(occGrid, dtype = bool)
+    digest = hashlib.blake2b(digest_size = 16)
+    digest.update(np.asarray(occGrid.shape, dtype = np.int64).tobytes())
+    digest.update(np.packbits(occGrid).tobytes())
+    return(digest.hexdigest())
+
+def copyResult(result, reverse): # cached results are never handed out, so callers cannot change them
+    path = [list(state) for state in result.path]
+    if reverse:
+        path = path[::-1]
+    return(SearchResult(path, result.cost, result.nodesExpanded, result.nodesDiscovered))
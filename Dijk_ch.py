@@ -0,0 +1,275 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Contraction Hierarchy]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: build a contraction hierarchy offline for a map that does not change, save it, and answer
+        point to point queries with two small upward searches instead of a search of the whole map
+
+--> contraction: free cells are removed one at a time, least important first. When a cell is removed,
+    every pair of its neighbours whose only lowest cost connection ran through it gets a shortcut edge
+    with the summed cost, so costs between the remaining cells never change
+--> importance = 2 * shortcuts the removal adds - edges it removes + neighbours removed already, the
+    last term spreads the removals over the map. Shortcuts are estimated from one and two move
+    detours only, so ordering never runs a search
+--> a witness search (small Dijkstra around the pair, skipping the removed cell) shows when a shortcut
+    is not needed. It only queues paths no dearer than the shortcut and gives up after WITNESS_POPS
+    pops, an extra shortcut only costs space
+--> query: Dijkstra from start and from goal that only follow edges to cells removed later, every lowest
+    cost path has such an up-down form, the best meeting cell joins them, shortcuts are then unpacked
+    back into the cells they replace. A node reached more cheaply from above is stalled, its edges
+    cannot be on a lowest cost path
+--> costs are counted in 1 / COST_SCALE units (10 straight, 14 diagonal), sums carry no floating point drift
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import heapq
+import numpy as np
+from Dijk_cache import mapFingerprint
+from Dijk_search import COST_SCALE, SearchResult, buildMoveMasks, buildMoveTable, checkState, toCellId, toState
+
+WITNESS_POPS = 100  # queue entries a witness search may pop before it gives up
+
+## ------------------------------------------------------------------------------------------
+#                                  Contraction Hierarchy Class
+## ------------------------------------------------------------------------------------------
+
+class ContractionHierarchy:
+
+    '''
+    Attributes:
+        occGrid: map the hierarchy was built for
+        connectivity: 8 or 4, same meaning as in findPath
+        cells: cell id of every node, nodes are the free cells in cell id order
+        rank: position of every node in the contraction order
+        upStart, upTarget, upCost, upVia: upward graph in compressed rows, the edges of node v are
+            upStart[v] to upStart[v + 1], each goes to a node of higher rank, upVia is the node a
+            shortcut replaces (-1 for a move between neighbouring cells)
+    '''
+
+    def __init__(self, occGrid, connectivity = 8, graph = None):
+        self.occGrid = np.ascontiguousarray(occGrid, dtype = bool)
+        self.mapHeight, self.mapWidth = self.occGrid.shape
+        self.connectivity = connectivity
+        self.cells = np.flatnonzero(~self.occGrid.reshape(-1))
+        self.nodeOf = np.full(self.occGrid.size, -1, dtype = np.int64)   # cell id --> node, -1 for obstacles
+        self.nodeOf[self.cells] = np.arange(self.cells.size)
+        if graph is None:
+            graph = self.contract(self.buildGraph())
+        self.rank, self.upStart, self.upTarget, self.upCost, self.upVia = graph
+
+        # plain lists for the queries, indexing them is much faster than indexing arrays one item at a time
+        self.upLists = (self.upStart.tolist(), self.upTarget.tolist(), self.upCost.tolist())
+        self.via = {}   # (node, node) --> node a shortcut replaces, both ways round
+        shortcuts = np.flatnonzero(self.upVia >= 0)
+        lower = np.repeat(np.arange(self.upStart.size - 1), np.diff(self.upStart))[shortcuts]
+        for a, b, middle in zip(lower.tolist(), self.upTarget[shortcuts].tolist(), self.upVia[shortcuts].tolist()):
+            self.via[(a, b)] = self.via[(b, a)] = middle
+
+    def __repr__(self):
+        numShortcuts = int(np.count_nonzero(self.upVia >= 0))
+        return(f' nodes: {self.cells.size}, upward edges: {self.upTarget.size}, shortcuts: {numShortcuts} ')
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Precomputation
+    ## --------------------------------------------------------------------------------------
+
+    def buildGraph(self): # node --> {neighbour node: cost} for every legal move between free cells
+        legalMoves = buildMoveMasks(self.occGrid, self.connectivity).reshape(-1)[self.cells]
+        adjacency = [{} for _ in range(self.cells.size)]
+        for bit, delta, step in buildMoveTable(self.mapWidth, self.connectivity):
+            legal = np.flatnonzero(legalMoves & bit)
+            cost = round(step * COST_SCALE)
+            for v, u in zip(legal.tolist(), self.nodeOf[self.cells[legal] + delta].tolist()):
+                adjacency[v][u] = cost
+        return(adjacency)
+
+    def contract(self, adjacency):
+
+        '''
+        Remove every node in order of importance, adding shortcuts as needed.
+        Returns (rank, upStart, upTarget, upCost, upVia).
+        '''
+
+        numNodes = len(adjacency)
+        removedNeighbours = [0] * numNodes
+        via = {}   # (node, node) --> node the current edge between them replaces, shortcuts only
+        rank = np.full(numNodes, -1, dtype = np.int64)
+        upward = [None] * numNodes
+
+        # lazy updates: an importance is recomputed when its node comes up, it is removed only if still
+        # no more important than the next node in the queue. Importance counts the shortcuts the one and
+        # two move check cannot rule out, only the removal itself runs witness searches
+        queue = [(2 * len(self.findShortcuts(adjacency, v, search = False)) - len(adjacency[v]), v) for v in range(numNodes)]
+        heapq.heapify(queue)
+        order = 0
+        while queue != []:
+            _, v = heapq.heappop(queue)
+            if rank[v] >= 0:
+                continue
+            estimate = self.findShortcuts(adjacency, v, search = False)
+            importance = 2 * len(estimate) - len(adjacency[v]) + removedNeighbours[v]
+            if queue != [] and importance > queue[0][0]:
+                heapq.heappush(queue, (importance, v))
+                continue
+            shortcuts = self.findShortcuts(adjacency, v)
+
+            # remove v --> its edges become its upward edges, every neighbour is removed later
+            rank[v] = order
+            order += 1
+            upward[v] = [(u, cost, via.get((v, u), -1)) for u, cost in adjacency[v].items()]
+            for u in adjacency[v]:
+                del adjacency[u][v]
+                removedNeighbours[u] += 1
+            for u, x, cost in shortcuts:
+                if cost < adjacency[u].get(x, float('inf')):
+                    adjacency[u][x] = adjacency[x][u] = cost
+                    via[(u, x)] = via[(x, u)] = v
+            adjacency[v] = {}
+
+        counts = np.array([len(edges) for edges in upward], dtype = np.int64)
+        upStart = np.concatenate(([0], np.cumsum(counts)))
+        edges = np.array([edge for edges in upward for edge in edges], dtype = np.int64).reshape(-1, 3)
+        return(rank, upStart, edges[:, 0].copy(), edges[:, 1].astype(np.int32), edges[:, 2].copy())
+
+    def findShortcuts(self, adjacency, v, search = True): # (u, x, cost) for every neighbour pair of v that needs a shortcut if v is removed
+        neighbours = list(adjacency[v].items())
+        shortcuts = []
+        for i, (u, toU) in enumerate(neighbours[:-1]):
+            # most witnesses on a grid are one or two moves around v --> check those before searching
+            edgesU = adjacency[u]
+            pending = {}   # neighbour x --> cost of u, v, x
+            for x, toX in neighbours[i + 1:]:
+                through = toU + toX
+                if edgesU.get(x, through + 1) <= through:
+                    continue
+                if not any(w != v and w in edgesU and edgesU[w] + step <= through for w, step in adjacency[x].items()):
+                    pending[x] = through
+            if pending and not search:   # estimate --> every pair left counts as a shortcut
+                shortcuts.extend((u, x, through) for x, through in pending.items())
+            elif pending:
+                reached = self.witnessSearch(adjacency, u, v, pending)
+                shortcuts.extend((u, x, through) for x, through in pending.items() if reached.get(x, float('inf')) > through)
+        return(shortcuts)
+
+    def witnessSearch(self, adjacency, source, skip, targets): # costs from source without passing skip, until every target is settled
+        # any reached cost is the cost of a real path, so it is a witness even before it is settled
+        reached = {source: 0}
+        queue = [(0, source)]
+        maxCost, remaining = max(targets.values()), len(targets)
+        for _ in range(WITNESS_POPS):
+            if queue == []:
+                break
+            cost, current = heapq.heappop(queue)
+            if cost > reached[current]:
+                continue
+            if current in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+            for child, step in adjacency[current].items():
+                childCost = cost + step
+                # paths costing more than the largest target cannot be witnesses, never queue them
+                if childCost <= maxCost and child != skip and childCost < reached.get(child, maxCost + 1):
+                    reached[child] = childCost
+                    heapq.heappush(queue, (childCost, child))
+        return(reached)
+
+    def save(self, fileName): # store the hierarchy so a restart does not rebuild it
+        with open(fileName, 'wb') as file:   # through a file, np.savez_compressed would add .npz to a bare name
+            np.savez_compressed(file, fingerprint = np.array(mapFingerprint(self.occGrid)), connectivity = np.array(self.connectivity),
+                                rank = self.rank, upStart = self.upStart, upTarget = self.upTarget, upCost = self.upCost, upVia = self.upVia)
+
+    @classmethod
+    def load(cls, fileName, occGrid): # hierarchy saved for this exact map, ValueError for any other map
+        with np.load(fileName) as data:
+            if str(data['fingerprint']) != mapFingerprint(occGrid):
+                raise ValueError(f"{fileName} was built for a different map")
+            graph = tuple(data[name] for name in ('rank', 'upStart', 'upTarget', 'upCost', 'upVia'))
+            connectivity = int(data['connectivity'])
+        return(cls(occGrid, connectivity, graph))
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Query Functions
+    ## --------------------------------------------------------------------------------------
+
+    def findPath(self, s, g):
+
+        '''
+        Lowest cost path from s to g, same cost as Dijk_search.findPath.
+        nodesExpanded counts the nodes settled by both upward searches.
+        '''
+
+        checkState(s, self.occGrid, "Start")
+        checkState(g, self.occGrid, "Goal")
+        upStart, upTarget, upCost = self.upLists
+        start, goal = int(self.nodeOf[toCellId(s, self.mapWidth)]), int(self.nodeOf[toCellId(g, self.mapWidth)])
+
+        # index 0 --> search from the start, 1 --> search from the goal
+        reached = ({start: 0}, {goal: 0})
+        parent = ({start: -1}, {goal: -1})
+        settled = (set(), set())
+        queues = ([(0, start)], [(0, goal)])
+        inf = float('inf')
+        best, meet = inf, -1
+
+        while True:
+            # Case 1 --> neither queue can improve on the best meeting cost, stop
+            side = 0 if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]) else 1
+            if not queues[side] or queues[side][0][0] >= best:
+                break
+
+            # Case 2 --> settle the cheaper side, check for a meeting, relax its upward edges
+            cost, current = heapq.heappop(queues[side])
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+            other = reached[1 - side].get(current)
+            if other is not None and cost + other < best:
+                best, meet = cost + other, current
+            edges = list(zip(upTarget[upStart[current]:upStart[current + 1]], upCost[upStart[current]:upStart[current + 1]]))
+            costs, parents, queue = reached[side], parent[side], queues[side]
+            for child, step in edges:
+                if costs.get(child, inf) + step < cost:
+                    break   # stall on demand --> a higher node reaches current more cheaply
+            else:
+                for child, step in edges:
+                    childCost = cost + step
+                    if childCost < costs.get(child, inf):
+                        costs[child] = childCost
+                        parents[child] = current
+                        heapq.heappush(queue, (childCost, child))
+
+        nodesExpanded, nodesDiscovered = len(settled[0]) + len(settled[1]), len(reached[0]) + len(reached[1])
+        if meet < 0:
+            return(SearchResult([], float('inf'), nodesExpanded, nodesDiscovered))
+
+        # chain of nodes start --> meet --> goal, then every edge unpacked into the cells it replaces
+        chain = [meet]
+        while parent[0][chain[-1]] != -1:
+            chain.append(parent[0][chain[-1]])
+        chain.reverse()
+        while parent[1][chain[-1]] != -1:
+            chain.append(parent[1][chain[-1]])
+        nodes = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            nodes.extend(self.unpackEdge(a, b))
+        path = [toState(cellId, self.mapWidth) for cellId in self.cells[nodes].tolist()]
+        return(SearchResult(path, best / COST_SCALE, nodesExpanded, nodesDiscovered))
+
+    def unpackEdge(self, a, b): # nodes after a up to b along the cells the edge a --> b stands for
+        nodes = []
+        stack = [(a, b)]
+        while stack != []:
+            a, b = stack.pop()
+            middle = self.via.get((a, b))
+            if middle is None:
+                nodes.append(b)
+            else:
+                stack.append((middle, b))   # the second half is popped after the first
+                stack.append((a, middle))
+        return(nodes)
@@ -0,0 +1,263 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Parallel Delta Stepping]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: compute the cost from a source to every cell of a very large map on many cores at once,
+        same costs as Dijk_search.fullSearch
+
+--> the map is cut into horizontal bands of rows, one worker process per band, and each worker
+    only ever writes the costs of its own cells, kept in one shared memory array
+--> delta stepping: open cells are kept in buckets of width delta by cost, the lowest bucket is
+    emptied by relaxing light moves (step <= delta) until no cell in it gets cheaper, then the
+    heavy moves of the cells it held are relaxed once, and the next non empty bucket follows
+--> a move can only leave a band into the neighbouring band's edge row, such moves are written to a
+    shared outbox row and the neighbour picks them up in an exchange round
+--> every round ends with all workers reporting back, so the parent is the only barrier needed
+--> costs are counted in 1 / COST_SCALE units (10 straight, 14 diagonal), sums carry no floating point drift
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from Dijk_search import COST_SCALE, buildMoveMasks, buildMoveTable, checkState, toCellId
+
+## ------------------------------------------------------------------------------------------
+#                                  Delta Stepping Function
+## ------------------------------------------------------------------------------------------
+
+def deltaStepping(occGrid, sources, connectivity = 8, moveMasks = None, delta = 2, workers = None):
+
+    '''
+    Cost from the nearest state in sources to every cell of occGrid, computed by workers processes.
+    Returns a float array (mapHeight, mapWidth), inf for obstacles and unreachable cells.
+    delta is the bucket width in map cost units, a wider bucket means fewer but larger rounds.
+    workers is os.cpu_count() when None, 1 runs the same rounds in this process.
+    '''
+
+    mapHeight, mapWidth = occGrid.shape
+    numCells = mapHeight * mapWidth
+    for state in sources:
+        checkState(state, occGrid, "Source")
+    sourceIds = np.unique(np.array([toCellId(state, mapWidth) for state in sources], dtype = np.int64))
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    moveTable = [(bit, offset, round(step * COST_SCALE)) for bit, offset, step in buildMoveTable(mapWidth, connectivity)]
+    width = max(1, round(delta * COST_SCALE))
+    hasHeavy = any(step > width for _, _, step in moveTable)
+
+    # a lowest cost path visits every cell at most once, so its cost fits in int32 up to ~150M cells
+    costType = np.int32 if max(step for _, _, step in moveTable) * numCells < np.iinfo(np.int32).max else np.int64
+    workers = max(1, min(workers or os.cpu_count() or 1, mapHeight))
+    edges = np.linspace(0, mapHeight, workers + 1).astype(int)   # band k holds rows edges[k] to edges[k + 1]
+
+    # one block for the move masks, one for the costs followed by each band's two outbox rows
+    maskMemory = SharedMemory(create = True, size = numCells)
+    costMemory = SharedMemory(create = True, size = (numCells + workers * 2 * mapWidth) * np.dtype(costType).itemsize)
+    layout = (maskMemory.name, costMemory.name, costType, numCells, mapWidth, workers, moveTable, width)
+    links, processes, shared = [], [], None
+    try:
+        shared = sharedViews(maskMemory, costMemory, costType, numCells, mapWidth, workers)
+        legalMoves, cost, outbox = shared
+        legalMoves[:] = np.asarray(moveMasks).reshape(-1)
+        cost[:] = np.iinfo(costType).max
+        outbox[:] = np.iinfo(costType).max
+        del legalMoves, cost, outbox
+
+        if workers == 1:
+            links.append(DirectLink(Band(shared, 0, 0, mapHeight, sourceIds, mapWidth, moveTable, width)))
+        else:
+            # fixed processes and not a pool --> every command for a band has to reach the worker that holds its buckets
+            for k in range(workers):
+                parentEnd, workerEnd = multiprocessing.Pipe()
+                process = multiprocessing.Process(target = runBand, args = (workerEnd, layout, k, edges[k], edges[k + 1], sourceIds), daemon = True)
+                process.start()
+                workerEnd.close()
+                links.append(parentEnd)
+                processes.append(process)
+
+        # Case 1 --> relax the light moves of the current bucket until no cell in it gets cheaper
+        # Case 2 --> relax the heavy moves of the cells it held once, then go to the lowest non empty bucket
+        replies = command(links, 'exchange', [(0, False, False)] * workers)
+        bucket = min((reply[3] for reply in replies if reply[3] is not None), default = None)
+        while bucket is not None:
+            while True:
+                replies = exchange(links, bucket, command(links, 'relaxLight', [(bucket,)] * workers))
+                if not any(reply[2] for reply in replies):
+                    break
+            if hasHeavy:
+                replies = exchange(links, bucket, command(links, 'relaxHeavy', [(bucket,)] * workers))
+            bucket = min((reply[3] for reply in replies if reply[3] is not None), default = None)
+
+        cost = shared[1]
+        distances = np.where(cost == np.iinfo(costType).max, np.inf, cost / COST_SCALE)
+        del cost
+        return(distances.reshape(mapHeight, mapWidth))
+    finally:
+        for link in links:
+            link.send(None)
+        for process in processes:
+            process.join()
+        links, shared = None, None   # release the views so the blocks can be closed
+        for memory in (maskMemory, costMemory):
+            memory.close()
+            memory.unlink()
+
+def command(links, name, argsList): # run one round --> send a command to every band, wait for all of them
+    for link, args in zip(links, argsList):
+        link.send((name, args))
+    return([link.recv() for link in links])
+
+def exchange(links, bucket, replies): # hand moves that crossed a band edge to the band they landed in, when there are any
+    if not any(reply[0] or reply[1] for reply in replies):
+        return(replies)
+    numBands = len(links)
+    argsList = [(bucket, k > 0 and replies[k - 1][1], k < numBands - 1 and replies[k + 1][0]) for k in range(numBands)]
+    return(command(links, 'exchange', argsList))
+
+## ------------------------------------------------------------------------------------------
+#                                        Band Class
+## ------------------------------------------------------------------------------------------
+
+class Band:
+
+    '''
+    Horizontal band of map rows, the only writer of the costs of its cells.
+    Every command returns (wrote below, wrote above, bucket still open, lowest open bucket),
+    the first two tell the parent which outbox rows the neighbours have to read.
+    '''
+
+    def __init__(self, shared, index, firstRow, lastRow, sourceIds, mapWidth, moveTable, width):
+        self.legalMoves, self.cost, self.outbox = shared
+        self.index = index
+        self.mapWidth = mapWidth
+        self.low, self.high = firstRow * mapWidth, lastRow * mapWidth   # cell ids owned by this band
+        self.width = width
+        self.lightMoves = [move for move in moveTable if move[2] <= width]
+        self.heavyMoves = [move for move in moveTable if move[2] > width]
+        self.buckets = {}    # bucket number --> list of cell id arrays, may hold cells that got cheaper since
+        self.settled = []    # cells taken from the current bucket, their heavy moves are relaxed once it is empty
+        self.wrote = [False, False]
+
+        own = sourceIds[(sourceIds >= self.low) & (sourceIds < self.high)]
+        self.cost[own] = 0
+        self.addCells(own)
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Command Functions
+    ## --------------------------------------------------------------------------------------
+
+    def relaxLight(self, bucket):
+        cells = self.takeBucket(bucket)
+        if self.heavyMoves:
+            self.settled.append(cells)
+        self.relax(cells, self.lightMoves)
+        return(self.report(bucket))
+
+    def relaxHeavy(self, bucket):
+        cells = np.unique(np.concatenate(self.settled)) if self.settled else np.empty(0, dtype = np.int64)
+        self.settled = []
+        self.relax(cells, self.heavyMoves)
+        return(self.report(bucket))
+
+    def exchange(self, bucket, readBelow, readAbove): # take the moves the neighbouring bands wrote into this band's edge rows
+        cost, mapWidth = self.cost, self.mapWidth
+        for read, row, first in ((readBelow, self.outbox[self.index - 1, 1], self.low),
+                                 (readAbove, self.outbox[(self.index + 1) % len(self.outbox), 0], self.high - mapWidth)):
+            if not read:
+                continue
+            better = np.flatnonzero(row < cost[first:first + mapWidth])
+            cost[first + better] = row[better]
+            row[:] = np.iinfo(cost.dtype).max
+            self.addCells(first + better)
+        return(self.report(bucket))
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Helper Functions
+    ## --------------------------------------------------------------------------------------
+
+    def relax(self, cells, moves): # vectorized relaxation of moves from cells, one shifted view per move
+        cost, low, high = self.cost, self.low, self.high
+        cellCost, cellMoves = cost[cells], self.legalMoves[cells]
+        children, childCosts = [], []
+        for bit, offset, step in moves:
+            legal = (cellMoves & bit) != 0
+            child = cells[legal] + offset
+            childCost = cellCost[legal] + step
+            inside = (child >= low) & (child < high)
+            if not inside.all():
+                # outside the band --> the cell is in the edge row of the neighbour below (0) or above (1)
+                for side, outside, first in ((0, child < low, low - self.mapWidth), (1, child >= high, high)):
+                    if outside.any():
+                        np.minimum.at(self.outbox[self.index, side], child[outside] - first, childCost[outside])
+                        self.wrote[side] = True
+                child, childCost = child[inside], childCost[inside]
+            better = childCost < cost[child]
+            children.append(child[better])
+            childCosts.append(childCost[better])
+        if children:
+            child = np.concatenate(children)
+            np.minimum.at(cost, child, np.concatenate(childCosts))
+            self.addCells(np.unique(child))
+
+    def takeBucket(self, bucket): # cells in the bucket that still belong there, each once
+        pending = self.buckets.pop(bucket, [])
+        if not pending:
+            return(np.empty(0, dtype = np.int64))
+        cells = np.unique(np.concatenate(pending))
+        return(cells[self.cost[cells] // self.width == bucket])
+
+    def addCells(self, cells):
+        if cells.size == 0:
+            return
+        numbers = self.cost[cells] // self.width
+        for number in np.unique(numbers).tolist():
+            self.buckets.setdefault(number, []).append(cells[numbers == number])
+
+    def report(self, bucket):
+        wroteBelow, wroteAbove = self.wrote
+        self.wrote = [False, False]
+        return((wroteBelow, wroteAbove, bool(self.buckets.get(bucket)), min(self.buckets, default = None)))
+
+class DirectLink: # same send / recv as a Pipe end, runs the band in this process
+
+    def __init__(self, band):
+        self.band = band
+        self.reply = None
+
+    def send(self, message):
+        if message is None:
+            self.band = None
+        else:
+            name, args = message
+            self.reply = getattr(self.band, name)(*args)
+
+    def recv(self):
+        return(self.reply)
+
+## ------------------------------------------------------------------------------------------
+#                                  Worker Functions
+## ------------------------------------------------------------------------------------------
+
+def sharedViews(maskMemory, costMemory, costType, numCells, mapWidth, workers): # (move masks, costs, outboxes) in the shared blocks
+    costs = np.ndarray(numCells + workers * 2 * mapWidth, dtype = costType, buffer = costMemory.buf)
+    legalMoves = np.ndarray(numCells, dtype = np.uint8, buffer = maskMemory.buf)
+    return((legalMoves, costs[:numCells], costs[numCells:].reshape(workers, 2, mapWidth)))
+
+def runBand(link, layout, index, firstRow, lastRow, sourceIds): # worker process --> answer commands until None arrives
+    maskName, costName, costType, numCells, mapWidth, workers, moveTable, width = layout
+    maskMemory, costMemory = SharedMemory(name = maskName), SharedMemory(name = costName)
+    band = Band(sharedViews(maskMemory, costMemory, costType, numCells, mapWidth, workers), index, firstRow, lastRow, sourceIds, mapWidth, moveTable, width)
+    while (message := link.recv()) is not None:
+        name, args = message
+        link.send(getattr(band, name)(*args))
+    del band   # release the views so the blocks can be closed, the parent unlinks them
+    maskMemory.close()
+    costMemory.close()
+    link.close()
@@ -0,0 +1,188 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [D* Lite Replanning]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: implement D* Lite, a planner that keeps its search state between calls so that when
+        obstacle cells are added or removed only the affected part of the solution is repaired
+
+--> searches backward from the goal, g = cost to goal, rhs = one step lookahead of g
+--> costs are counted in 1 / COST_SCALE units (10 straight, 14 diagonal) so g and rhs compare exactly
+--> a step costs inf when either of its cells is an obstacle
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import heapq
+from array import array
+import numpy as np
+from Dijk_search import COST_SCALE, SearchResult, checkState, getMoves, toCellId, toState
+
+## ------------------------------------------------------------------------------------------
+#                                     D* Lite Class
+## ------------------------------------------------------------------------------------------
+
+class DStarLite:
+
+    '''
+    Attributes:
+        occGrid: planner's own copy of the map, changed through updateObstacles
+        start: state the path is planned from, changed through moveStart
+        goal: state the path is planned to
+        nodesExpanded: cells popped from the queue by the last findPath call
+        nodesQueued: cells queued since the previous findPath call, by updates and by the search
+    '''
+
+    def __init__(self, occGrid, s, g, connectivity = 8):
+        checkState(s, occGrid, "Start")
+        checkState(g, occGrid, "Goal")
+        self.occGrid = np.array(occGrid, dtype = bool)
+        self.mapHeight, self.mapWidth = self.occGrid.shape
+        self.blocked = memoryview(self.occGrid.view(np.uint8).reshape(-1))   # writes to occGrid show up here
+        self.moves = tuple((dx, dy, round(step * COST_SCALE)) for dx, dy, step in getMoves(connectivity))
+        self.connectivity = connectivity
+        self.start, self.goal = list(s), list(g)
+        self.startId, self.goalId = toCellId(s, self.mapWidth), toCellId(g, self.mapWidth)
+        self.nodesExpanded = 0
+        self.nodesQueued = 0
+
+        numCells = self.mapHeight * self.mapWidth
+        self.unreached = numCells * 14 + 1     # larger than any path cost, stands in for inf
+        self.gCost = array('q', [self.unreached]) * numCells
+        self.rhs = array('q', [self.unreached]) * numCells
+        self.km = 0                            # heuristic offset that grows as the start moves
+        self.queue = []                        # heap of (key, cellId), entries not matching openKeys are stale
+        self.openKeys = {}                     # cellId --> key of its live queue entry
+        self.rhs[self.goalId] = 0
+        self.pushCell(self.goalId)
+
+    def __repr__(self):
+        return(f' start: {self.start}, goal: {self.goal}, queued: {len(self.openKeys)} ')
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Public Functions
+    ## --------------------------------------------------------------------------------------
+
+    def findPath(self): # repair the search as needed, then read the path off the g values
+
+        self.computeShortestPath()
+        nodesQueued, self.nodesQueued = self.nodesQueued, 0
+        if self.gCost[self.startId] >= self.unreached:
+            return(SearchResult([], float('inf'), self.nodesExpanded, nodesQueued))
+
+        path = [self.startId]
+        current = self.startId
+        while current != self.goalId:   # step to the neighbour with the lowest step cost + cost to goal
+            following = min(self.getNeighbours(current), key = lambda pair: pair[1] + self.gCost[pair[0]], default = (current, 0))[0]
+            # with consistent g values every step lowers the cost to goal, anything else would walk in circles
+            if self.gCost[following] >= self.gCost[current]:
+                raise RuntimeError(f"D* Lite g values are inconsistent at {toState(current, self.mapWidth)}, no path can be read")
+            current = following
+            path.append(current)
+        cost = self.gCost[self.startId] / COST_SCALE
+        return(SearchResult([toState(cellId, self.mapWidth) for cellId in path], cost, self.nodesExpanded, nodesQueued))
+
+    def updateObstacles(self, added = (), removed = ()): # cells [x, y] that became obstacles / became free
+        updates = [(state, True) for state in added] + [(state, False) for state in removed]
+        # every cell is checked before any is written, a bad cell leaves the planner as it was
+        for state, value in updates:
+            if not (1 <= state[0] <= self.mapWidth and 1 <= state[1] <= self.mapHeight):
+                raise ValueError(f"Obstacle outside Map: {state}")
+            if value and list(state) in (self.start, self.goal):
+                raise ValueError(f"Obstacle on start or goal: {state}")
+
+        changed = []
+        for state, value in updates:
+            if self.occGrid[state[1] - 1, state[0] - 1] != value:
+                self.occGrid[state[1] - 1, state[0] - 1] = value
+                changed.append(toCellId(state, self.mapWidth))
+
+        # every step into or out of a changed cell changed cost --> recheck the cell and its neighbours
+        for cellId in changed:
+            self.updateVertex(cellId)
+            for neighbour, _ in self.getNeighbours(cellId, anyCost = True):
+                self.updateVertex(neighbour)
+
+    def moveStart(self, s): # the agent moved, keys already in the queue stay valid through km
+        checkState(s, self.occGrid, "Start")
+        self.km += self.heuristic(self.startId, toCellId(s, self.mapWidth))
+        self.start, self.startId = list(s), toCellId(s, self.mapWidth)
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Search Functions
+    ## --------------------------------------------------------------------------------------
+
+    def computeShortestPath(self):
+        self.nodesExpanded = 0
+        while self.queue != []:
+            key, current = self.queue[0]
+            if self.openKeys.get(current) != key:   # stale entry
+                heapq.heappop(self.queue)
+                continue
+            startKey = self.calculateKey(self.startId)
+            if key >= startKey and self.rhs[self.startId] == self.gCost[self.startId]:
+                break
+            heapq.heappop(self.queue)
+            del self.openKeys[current]
+            self.nodesExpanded += 1
+
+            newKey = self.calculateKey(current)
+            if key < newKey:    # key was computed with an older km
+                self.pushCell(current)
+            elif self.gCost[current] > self.rhs[current]:   # overconsistent --> cost to goal went down
+                self.gCost[current] = self.rhs[current]
+                for neighbour, _ in self.getNeighbours(current):
+                    self.updateVertex(neighbour)
+            else:                                           # underconsistent --> cost to goal went up
+                self.gCost[current] = self.unreached
+                self.updateVertex(current)
+                for neighbour, _ in self.getNeighbours(current, anyCost = True):
+                    self.updateVertex(neighbour)
+
+    def updateVertex(self, cellId):
+        if cellId != self.goalId:
+            best = self.unreached
+            for neighbour, step in self.getNeighbours(cellId):
+                best = min(best, step + self.gCost[neighbour])
+            self.rhs[cellId] = min(best, self.unreached)
+        self.openKeys.pop(cellId, None)
+        if self.gCost[cellId] != self.rhs[cellId]:
+            self.pushCell(cellId)
+
+    def pushCell(self, cellId):
+        key = self.calculateKey(cellId)
+        self.openKeys[cellId] = key
+        self.nodesQueued += 1
+        heapq.heappush(self.queue, (key, cellId))
+
+    def calculateKey(self, cellId):
+        best = min(self.gCost[cellId], self.rhs[cellId])
+        return((best + self.heuristic(self.startId, cellId) + self.km, best))
+
+    def heuristic(self, a, b): # octile (or manhattan) distance between two cell ids in 1 / COST_SCALE units
+        dx = abs(a % self.mapWidth - b % self.mapWidth)
+        dy = abs(a // self.mapWidth - b // self.mapWidth)
+        if self.connectivity == 8:
+            return(10 * max(dx, dy) + 4 * min(dx, dy))
+        return(10 * (dx + dy))
+
+    def getNeighbours(self, cellId, anyCost = False):
+
+        '''
+        (neighbour cell id, step cost) for every move inside the map.
+        Steps into or out of an obstacle are skipped, or kept when anyCost is True.
+        '''
+
+        x, y = cellId % self.mapWidth, cellId // self.mapWidth
+        fromBlocked = self.blocked[cellId]
+        neighbours = []
+        for dx, dy, step in self.moves:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.mapWidth and 0 <= ny < self.mapHeight:
+                neighbour = cellId + dy * self.mapWidth + dx
+                if anyCost or not (fromBlocked or self.blocked[neighbour]):
+                    neighbours.append((neighbour, step))
+        return(neighbours)
@@ -0,0 +1,82 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Flow Field]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: run Dijkstra once from a shared goal over the whole map, so that any number of agents
+        can read their path to that goal from the result instead of searching again
+
+--> steps are symmetric (same cost both ways), so cost to come from the goal = cost to go to it
+--> nextStep holds the index into MOVES of the first step from a cell towards the goal
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import numpy as np
+from Dijk_search import MOVES, checkState, fullSearch
+
+## ------------------------------------------------------------------------------------------
+#                                     Flow Field Class
+## ------------------------------------------------------------------------------------------
+
+class FlowField:
+
+    '''
+    Attributes:
+        goal: state every path leads to
+        costToGo: float array (mapHeight, mapWidth), cost from every cell to goal, inf if goal cannot be reached
+        nextStep: int8 array (mapHeight, mapWidth), move index of the first step towards goal, -1 at goal and unreachable cells
+    '''
+
+    def __init__(self, goal, costToGo, nextStep):
+        self.goal = list(goal)
+        self.costToGo = costToGo
+        self.nextStep = nextStep
+
+    def __repr__(self):
+        return(f' goal: {self.goal}, reachable cells: {int(np.isfinite(self.costToGo).sum())} ')
+
+    def getCost(self, s): # cost to reach goal from s, inf if goal cannot be reached (obstacles included)
+        mapHeight, mapWidth = self.costToGo.shape
+        if not (1 <= s[0] <= mapWidth and 1 <= s[1] <= mapHeight):   # checked before indexing, numpy wraps negative indices
+            raise ValueError(f"Start Node outside Map: {s}")
+        return(float(self.costToGo[s[1] - 1, s[0] - 1]))
+
+    def getPath(self, s): # follow nextStep from s --> list is start to goal, empty if goal cannot be reached, ValueError outside the map
+        if not np.isfinite(self.getCost(s)):
+            return([])
+        path = [list(s)]
+        x, y = s[0], s[1]
+        while [x, y] != self.goal:
+            dx, dy, _ = MOVES[self.nextStep[y - 1, x - 1]]
+            x, y = x + dx, y + dy
+            path.append([x, y])
+        return(path)
+
+## ------------------------------------------------------------------------------------------
+#                                     Flow Field Function
+## ------------------------------------------------------------------------------------------
+
+def buildFlowField(occGrid, g, connectivity = 8, moveMasks = None):
+    checkState(g, occGrid, "Goal")
+    mapHeight, mapWidth = occGrid.shape
+    c2c, parent = fullSearch(occGrid, [g], connectivity, moveMasks)
+
+    costToGo = np.frombuffer(c2c, dtype = np.float64).reshape(mapHeight, mapWidth)
+    parent = np.frombuffer(parent, dtype = np.int32)
+
+    # the parent of a cell in the tree grown from the goal is its next step towards the goal
+    cellIds = np.arange(mapHeight * mapWidth)
+    hasParent = parent >= 0
+    dx = parent[hasParent] % mapWidth - cellIds[hasParent] % mapWidth
+    dy = parent[hasParent] // mapWidth - cellIds[hasParent] // mapWidth
+    moveIndex = np.full((3, 3), -1, dtype = np.int8)   # moveIndex[dy + 1, dx + 1] --> index into MOVES
+    for i, (mx, my, _) in enumerate(MOVES):
+        moveIndex[my + 1, mx + 1] = i
+
+    nextStep = np.full(mapHeight * mapWidth, -1, dtype = np.int8)
+    nextStep[hasParent] = moveIndex[dy + 1, dx + 1]
+    return(FlowField(g, costToGo, nextStep.reshape(mapHeight, mapWidth)))
@@ -0,0 +1,233 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Hierarchical Search]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: implement HPA*, split the map into square clusters, precompute entrance nodes on the cluster
+        borders and the costs between entrances of the same cluster once, then answer each query
+        on the small abstract graph and refine only the clusters the abstract path passes through
+
+--> entrances: every run of free cell pairs across a border gets one transition in its middle,
+    runs of 6 or more get one at each end. A diagonal step across a border whose two corner cells
+    are both blocked gets its own transition, so no connection between clusters is lost
+--> abstract paths are complete but near optimal: inside a cluster the path must go through entrances
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import heapq
+import numpy as np
+from Dijk_cache import mapFingerprint
+from Dijk_search import SearchResult, checkState, findPath, fullSearch, getMoves, octileDistance, toCellId, toState
+
+## ------------------------------------------------------------------------------------------
+#                                     Hierarchical Map Class
+## ------------------------------------------------------------------------------------------
+
+class HierarchicalMap:
+
+    '''
+    Attributes:
+        occGrid: map the abstraction was built for
+        clusterSize: width and height of a cluster in cells, clusters on the right / top edge may be smaller
+        connectivity: 8 or 4, same meaning as in findPath
+        edges: abstract graph, entrance cell id --> {entrance cell id: cost}
+    '''
+
+    def __init__(self, occGrid, clusterSize = 16, connectivity = 8, edges = None):
+        self.occGrid = np.ascontiguousarray(occGrid, dtype = bool)
+        self.mapHeight, self.mapWidth = self.occGrid.shape
+        self.clusterSize = clusterSize
+        self.connectivity = connectivity
+        getMoves(connectivity)   # fail early on a bad connectivity
+        if edges is None:
+            edges = self.buildAbstractGraph()
+        self.edges = edges
+        self.clusterNodes = {}   # (cluster x, cluster y) --> entrance cell ids inside that cluster
+        for cellId in self.edges:
+            self.clusterNodes.setdefault(self.getCluster(cellId), []).append(cellId)
+
+    def __repr__(self):
+        numEdges = sum(len(links) for links in self.edges.values())
+        return(f' clusters of {self.clusterSize}, entrances: {len(self.edges)}, abstract edges: {numEdges} ')
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Precomputation
+    ## --------------------------------------------------------------------------------------
+
+    def buildAbstractGraph(self):
+        edges = {}
+        for a, b, step in self.findTransitions():   # steps across a cluster border
+            edges.setdefault(a, {})[b] = step
+            edges.setdefault(b, {})[a] = step
+
+        byCluster = {}
+        for cellId in edges:
+            byCluster.setdefault(self.getCluster(cellId), []).append(cellId)
+        for cluster, nodes in byCluster.items():   # costs between entrances of the same cluster
+            for cellId in nodes:
+                for other, cost in self.searchCluster(cellId, nodes).items():
+                    if other != cellId:
+                        edges[cellId][other] = cost
+        return(edges)
+
+    def findTransitions(self): # (cell id, cell id, step cost) of every transition across a cluster border
+        free = ~self.occGrid
+        size = self.clusterSize
+        transitions = []
+
+        # straight steps --> vertical borders (x step) and horizontal borders (y step)
+        for axis in (1, 0):
+            for border in range(size, free.shape[axis], size):
+                if axis == 1:
+                    pairs = free[:, border - 1] & free[:, border]
+                else:
+                    pairs = free[border - 1, :] & free[border, :]
+                for bandStart in range(0, len(pairs), size):
+                    run = []
+                    for i in range(bandStart, min(bandStart + size, len(pairs)) + 1):
+                        if i < min(bandStart + size, len(pairs)) and pairs[i]:
+                            run.append(i)
+                            continue
+                        if run != []:
+                            picks = {run[len(run) // 2]} if len(run) < 6 else {run[0], run[-1]}
+                            for i2 in picks:
+                                if axis == 1:
+                                    transitions.append((i2 * self.mapWidth + border - 1, i2 * self.mapWidth + border, 1))
+                                else:
+                                    transitions.append(((border - 1) * self.mapWidth + i2, border * self.mapWidth + i2, 1))
+                        run = []
+
+        # diagonal steps across a border with both corner cells blocked
+        if self.connectivity == 8:
+            rows, cols = np.nonzero(free)
+            for dy in (1, -1):
+                ny, nx = rows + dy, cols + 1
+                inMap = (ny >= 0) & (ny < self.mapHeight) & (nx < self.mapWidth)
+                y, x, ny, nx = rows[inMap], cols[inMap], ny[inMap], nx[inMap]
+                keep = free[ny, nx] & ~free[y, nx] & ~free[ny, x]
+                keep &= (x // size != nx // size) | (y // size != ny // size)
+                for y1, x1, y2, x2 in zip(y[keep], x[keep], ny[keep], nx[keep]):
+                    transitions.append((int(y1) * self.mapWidth + int(x1), int(y2) * self.mapWidth + int(x2), 1.4))
+        return(transitions)
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Query
+    ## --------------------------------------------------------------------------------------
+
+    def findPath(self, s, g):
+
+        '''
+        Search the abstract graph from s to g, then refine each step of the abstract path into cells.
+        Returns a SearchResult like Dijk_search.findPath, counting abstract and refinement expansions.
+        '''
+
+        checkState(s, self.occGrid, "Start")
+        checkState(g, self.occGrid, "Goal")
+        startId, goalId = toCellId(s, self.mapWidth), toCellId(g, self.mapWidth)
+
+        # temporary links --> start to the entrances of its cluster, entrances of the goal cluster to goal
+        # a goal in the start cluster is a target too --> the direct path inside the cluster is a candidate
+        startLinks = self.searchCluster(startId, self.clusterNodes.get(self.getCluster(startId), []) + [goalId])
+        goalLinks = self.searchCluster(goalId, self.clusterNodes.get(self.getCluster(goalId), []))
+
+        # A* on the abstract graph
+        c2c, parent, closed = {startId: 0.0}, {startId: -1}, set()
+        queue = [(0.0, 0, startId)]
+        order = 0
+        while queue != []:
+            current = heapq.heappop(queue)[2]
+            if current in closed:
+                continue
+            closed.add(current)
+            if current == goalId:
+                break
+            links = dict(self.edges.get(current, {}))
+            if current == startId:
+                links.update(startLinks)
+            if current in goalLinks:
+                links[goalId] = goalLinks[current]
+            for child, step in links.items():
+                childCost = c2c[current] + step
+                if child not in closed and childCost < c2c.get(child, float('inf')):
+                    c2c[child] = childCost
+                    parent[child] = current
+                    order -= 1
+                    heapq.heappush(queue, (childCost + octileDistance(toState(child, self.mapWidth), g, self.connectivity), order, child))
+
+        if goalId not in closed:
+            return(SearchResult([], float('inf'), len(closed), len(c2c)))
+
+        abstractPath = []
+        current = goalId
+        while current != -1:
+            abstractPath.append(current)
+            current = parent[current]
+        abstractPath = abstractPath[::-1]
+
+        # refine --> steps inside one cluster are searched in that cluster only, border steps are single moves
+        path, nodesExpanded = [list(s)], len(closed)
+        for a, b in zip(abstractPath, abstractPath[1:]):
+            if self.getCluster(a) == self.getCluster(b):
+                subGrid, x0, y0 = self.getClusterGrid(a)
+                pa, pb = toState(a, self.mapWidth), toState(b, self.mapWidth)
+                refined = findPath(subGrid, [pa[0] - x0, pa[1] - y0], [pb[0] - x0, pb[1] - y0], connectivity = self.connectivity)
+                path.extend([[x + x0, y + y0] for x, y in refined.path[1:]])
+                nodesExpanded += refined.nodesExpanded
+            else:
+                path.append(toState(b, self.mapWidth))
+        return(SearchResult(path, c2c[goalId], nodesExpanded, len(c2c)))
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Save and Load
+    ## --------------------------------------------------------------------------------------
+
+    def save(self, fileName): # store the abstract graph so a restart does not rebuild it
+        src = [a for a, links in self.edges.items() for b in links]
+        dst = [b for a, links in self.edges.items() for b in links]
+        cost = [step for a, links in self.edges.items() for step in links.values()]
+        with open(fileName, 'wb') as file:   # through a file, np.savez_compressed would add .npz to a bare name
+            np.savez_compressed(file, fingerprint = np.array(mapFingerprint(self.occGrid)),
+                                settings = np.array([self.clusterSize, self.connectivity]),
+                                src = np.array(src, dtype = np.int64), dst = np.array(dst, dtype = np.int64),
+                                cost = np.array(cost, dtype = np.float64))
+
+    @classmethod
+    def load(cls, fileName, occGrid): # abstract graph saved for this exact map, ValueError for any other map
+        with np.load(fileName) as data:
+            if str(data['fingerprint']) != mapFingerprint(occGrid):
+                raise ValueError(f"{fileName} was built for a different map")
+            clusterSize, connectivity = (int(value) for value in data['settings'])
+            edges = {}
+            for a, b, step in zip(data['src'].tolist(), data['dst'].tolist(), data['cost'].tolist()):
+                edges.setdefault(a, {})[b] = step
+        return(cls(occGrid, clusterSize, connectivity, edges))
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Helper Functions
+    ## --------------------------------------------------------------------------------------
+
+    def getCluster(self, cellId): # (cluster x, cluster y) of a cell id
+        return((cellId % self.mapWidth // self.clusterSize, cellId // self.mapWidth // self.clusterSize))
+
+    def getClusterGrid(self, cellId): # occupancy grid of the cluster holding cellId and its (x, y) offset
+        cx, cy = self.getCluster(cellId)
+        x0, y0 = cx * self.clusterSize, cy * self.clusterSize
+        return(self.occGrid[y0:y0 + self.clusterSize, x0:x0 + self.clusterSize], x0, y0)
+
+    def searchCluster(self, cellId, targets): # {target: cost} from cellId for the targets reachable inside its cluster
+        subGrid, x0, y0 = self.getClusterGrid(cellId)
+        state = toState(cellId, self.mapWidth)
+        c2c, _ = fullSearch(subGrid, [[state[0] - x0, state[1] - y0]], self.connectivity)
+        subWidth = subGrid.shape[1]
+        cluster = self.getCluster(cellId)
+        costs = {}
+        for target in targets:
+            if self.getCluster(target) == cluster:
+                cost = c2c[(target // self.mapWidth - y0) * subWidth + target % self.mapWidth - x0]
+                if cost < float('inf'):
+                    costs[target] = cost
+        return(costs)
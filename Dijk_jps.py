@@ -0,0 +1,135 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Jump Point Search]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: implement Jump Point Search on the 8-connected grid used by the map scripts, so long
+        straight and diagonal runs are crossed in one step and only jump points enter the queue
+
+--> same moves as Dijk_search: 1 straight, 1.4 diagonal, diagonal steps may pass obstacle corners
+--> A* over jump points with the octile heuristic, path cost equals the Dijkstra path cost
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import heapq
+import numpy as np
+from Dijk_search import SearchResult, checkState, octileDistance
+
+## ------------------------------------------------------------------------------------------
+#                                     Jump Point Search Function
+## ------------------------------------------------------------------------------------------
+
+def jumpPointSearch(occGrid, s, g, observer = None, stats = None):
+
+    '''
+    Lowest cost path from s to g on occGrid, 8-connected only.
+    observer, if given, is called with the state of every jump point popped from the queue.
+    stats, a Dijk_search.SearchStats, counts and times the queue operations when given.
+    '''
+
+    checkState(s, occGrid, "Start")
+    checkState(g, occGrid, "Goal")
+    mapHeight, mapWidth = occGrid.shape
+    push, pop = (stats.push, stats.pop) if stats is not None else (heapq.heappush, heapq.heappop)
+
+    # map padded with a ring of obstacles --> cell id = y * padWidth + x for state [x, y], no bound checks
+    padWidth = mapWidth + 2
+    free = np.pad(~np.asarray(occGrid, dtype = bool), 1, constant_values = False).astype(np.uint8).tobytes()
+    startId, goalId = int(s[1]) * padWidth + int(s[0]), int(g[1]) * padWidth + int(g[0])   # plain ints, numpy ints would leak into every cell id
+
+    def jump(p, dx, dy): # step from p in direction (dx, dy) until a jump point, -1 if a wall is hit first
+        delta = dx + dy * padWidth
+        while True:
+            p += delta
+            if not free[p]:
+                return(-1)
+            if p == goalId:
+                return(p)
+            if dx and dy:
+                if (free[p - dx + dy * padWidth] and not free[p - dx]) or (free[p + dx - dy * padWidth] and not free[p - dy * padWidth]):
+                    return(p)   # forced neighbour
+                if jump(p, dx, 0) != -1 or jump(p, 0, dy) != -1:
+                    return(p)   # a straight run from here reaches a jump point
+            elif dx:
+                if (free[p + dx + padWidth] and not free[p + padWidth]) or (free[p + dx - padWidth] and not free[p - padWidth]):
+                    return(p)
+            else:
+                if (free[p + 1 + dy * padWidth] and not free[p + 1]) or (free[p - 1 + dy * padWidth] and not free[p - 1]):
+                    return(p)
+
+    def directions(p, parentId): # pruned search directions from p given the jump point it was reached from
+        if parentId == -1:
+            return(((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)))
+        px, py = p % padWidth - parentId % padWidth, p // padWidth - parentId // padWidth
+        dx, dy = (px > 0) - (px < 0), (py > 0) - (py < 0)
+        if dx and dy:
+            dirs = [(0, dy), (dx, 0), (dx, dy)]
+            if not free[p - dx]:
+                dirs.append((-dx, dy))
+            if not free[p - dy * padWidth]:
+                dirs.append((dx, -dy))
+        elif dx:
+            dirs = [(dx, 0)]
+            if not free[p + padWidth]:
+                dirs.append((dx, 1))
+            if not free[p - padWidth]:
+                dirs.append((dx, -1))
+        else:
+            dirs = [(0, dy)]
+            if not free[p + 1]:
+                dirs.append((1, dy))
+            if not free[p - 1]:
+                dirs.append((-1, dy))
+        return(dirs)
+
+    def toState(p):
+        return([p % padWidth, p // padWidth])
+
+    c2c = {startId: 0.0}          # cost to come of every discovered jump point
+    parent = {startId: -1}        # jump point each one was reached from
+    closed = set()
+    queue = [(octileDistance(s, g), 0, startId)]   # heap of (f, order, cell id), ties last in first out
+    order = 0
+
+    while queue != []:
+        current = pop(queue)[2]
+        if current in closed:     # stale entry, jump point was already explored at a lower cost
+            continue
+        closed.add(current)
+        if observer is not None:
+            observer(toState(current))
+
+        # Case 1 --> Goal Reached, fill in the straight and diagonal runs between jump points
+        if current == goalId:
+            jumpPoints = []
+            while current != -1:
+                jumpPoints.append(toState(current))
+                current = parent[current]
+            jumpPoints = jumpPoints[::-1]
+            path = [jumpPoints[0]]
+            for x, y in jumpPoints[1:]:
+                dx, dy = (x > path[-1][0]) - (x < path[-1][0]), (y > path[-1][1]) - (y < path[-1][1])
+                while path[-1] != [x, y]:
+                    path.append([path[-1][0] + dx, path[-1][1] + dy])
+            return(SearchResult(path, c2c[goalId], len(closed), len(c2c)))
+
+        # Case 2: goal not reached, jump in every pruned direction
+        currentState = toState(current)
+        for dx, dy in directions(current, parent[current]):
+            child = jump(current, dx, dy)
+            if child == -1 or child in closed:
+                continue
+            childState = toState(child)
+            childCost = c2c[current] + octileDistance(currentState, childState)
+            if childCost < c2c.get(child, float('inf')):
+                c2c[child] = childCost
+                parent[child] = current
+                order -= 1
+                push(queue, (childCost + octileDistance(childState, g), order, child))
+
+    # queue exhausted --> goal cannot be reached from start
+    return(SearchResult([], float('inf'), len(closed), len(c2c)))
@@ -0,0 +1,106 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Map Files]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: load occupancy grids from disk instead of building them from hard coded geometry, memory
+        mapped so a large map opens at once and only the pages a search reads are loaded
+
+--> .npy files hold the grid itself (bool, True = obstacle) and are mapped without a copy,
+    processes mapping the same file share the pages through the OS page cache
+--> .pgm files (binary P5, 8 bit) are grey images with dark pixels as obstacles, thresholding them
+    makes an in memory copy, convertMap turns a large PGM into a .npy once, one band of rows at a time
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import os
+import numpy as np
+
+## ------------------------------------------------------------------------------------------
+#                                     Load and Save Functions
+## ------------------------------------------------------------------------------------------
+
+def loadMap(fileName, threshold = 128):
+
+    '''
+    Occupancy grid stored in fileName, read only.
+    .npy --> memory mapped bool array, dtype must be bool or uint8 holding 0 / 1
+    .pgm --> pixels darker than threshold are obstacles
+    '''
+
+    extension = os.path.splitext(fileName)[1].lower()
+    if extension == '.npy':
+        occGrid = np.load(fileName, mmap_mode = 'r')
+        if occGrid.ndim != 2 or occGrid.dtype not in (np.bool_, np.uint8):
+            raise ValueError(f"{fileName} must hold a 2D bool or uint8 grid, not {occGrid.ndim}D {occGrid.dtype}")
+        if occGrid.dtype == np.uint8:
+            # viewed as bool, any value but 0 / 1 would be an invalid bool --> checked one band of rows at a
+            # time, the file is read once but never copied
+            for row in range(0, occGrid.shape[0], 1024):
+                if occGrid[row:row + 1024].max(initial = 0) > 1:
+                    raise ValueError(f"{fileName} is a uint8 grid, every cell must be 0 or 1")
+        return(occGrid.view(np.bool_))
+    if extension == '.pgm':
+        return(readPgm(fileName) < threshold)
+    raise ValueError(f"Unknown map file type: {fileName}")
+
+def saveMap(fileName, occGrid): # write occGrid as .npy (bool) or .pgm (obstacles 0, free cells 255)
+    occGrid = np.asarray(occGrid, dtype = bool)
+    extension = os.path.splitext(fileName)[1].lower()
+    if extension == '.npy':
+        np.save(fileName, occGrid)
+    elif extension == '.pgm':
+        mapHeight, mapWidth = occGrid.shape
+        with open(fileName, 'wb') as file:
+            file.write(f"P5\n{mapWidth} {mapHeight}\n255\n".encode('ascii'))
+            file.write(np.where(occGrid, 0, 255).astype(np.uint8).tobytes())
+    else:
+        raise ValueError(f"Unknown map file type: {fileName}")
+
+def convertMap(pgmFile, npyFile, threshold = 128, bandRows = 1024): # threshold a PGM into a .npy without holding either in memory
+    pixels = readPgm(pgmFile)
+    occGrid = np.lib.format.open_memmap(npyFile, mode = 'w+', dtype = np.bool_, shape = pixels.shape)
+    for row in range(0, pixels.shape[0], bandRows):
+        occGrid[row:row + bandRows] = pixels[row:row + bandRows] < threshold
+    occGrid.flush()
+    del occGrid
+
+## ------------------------------------------------------------------------------------------
+#                                  Helper Functions
+## ------------------------------------------------------------------------------------------
+
+def readPgm(fileName): # memory mapped pixel rows of a binary 8 bit PGM
+
+    with open(fileName, 'rb') as file:
+        header = file.read(512)
+    fields, pos = [], 0
+    while len(fields) < 4:   # magic, width, height, maxval separated by whitespace, '#' starts a comment
+        while pos < len(header) and header[pos:pos + 1].isspace():
+            pos += 1
+        if header[pos:pos + 1] == b'#':
+            pos = header.index(b'\n', pos)
+            continue
+        end = pos
+        while end < len(header) and not header[end:end + 1].isspace():
+            end += 1
+        if end == pos:
+            raise ValueError(f"{fileName} has a truncated PGM header")
+        fields.append(header[pos:end])
+        pos = end
+    if fields[0] != b'P5':
+        raise ValueError(f"{fileName} is not a binary PGM (P5)")
+    mapWidth, mapHeight, maxValue = (int(field) for field in fields[1:])
+    if maxValue > 255:
+        raise ValueError(f"{fileName} uses 16 bit pixels, only 8 bit PGM is supported")
+    return(np.memmap(fileName, dtype = np.uint8, mode = 'r', offset = pos + 1, shape = (mapHeight, mapWidth)))
+
+def getMapFile(occGrid): # (fileName, offset) when occGrid is a whole mapped .npy grid, None otherwise
+    if not isinstance(occGrid, np.memmap) or occGrid.filename is None or occGrid.dtype != np.bool_:
+        return(None)
+    if not occGrid.flags.c_contiguous or occGrid.offset + occGrid.nbytes != os.path.getsize(occGrid.filename):
+        return(None)   # a slice of the file, or pixels that were not stored as a bool grid
+    return((occGrid.filename, occGrid.offset))
@@ -0,0 +1,100 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Map Builders]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: build the occupancy grids of the three map scripts without importing pygame, plus
+        synthetic maps of any size for benchmarks
+
+--> occGrid[y-1, x-1] is True when cell (x, y) is an obstacle
+--> synthetic maps are seeded, the same arguments always give the same map
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import numpy as np
+
+## ------------------------------------------------------------------------------------------
+#                                     Script Maps
+## ------------------------------------------------------------------------------------------
+
+def buildEmptyMap(mapHeight = 10, mapWidth = 10):
+    return(np.zeros((mapHeight, mapWidth), dtype = bool))
+
+def buildObstacleMap(mapNum, mapHeight = 10, mapWidth = 10):
+    x, y = np.meshgrid(np.arange(1, mapWidth + 1), np.arange(1, mapHeight + 1))
+    occGrid = np.zeros((mapHeight, mapWidth), dtype = bool)
+
+    if mapNum == 1:
+        occGrid |= (x-3)**2 + (y-7)**2 - (1)**2 <= 0 # Circle 1
+        occGrid |= (x-5)**2 + (y-3)**2 - (2)**2 <= 0 # Circle 2
+        occGrid |= (x-9)**2 + (y-7)**2 - (1)**2 <= 0 # Circle 3
+    elif mapNum == 2:
+        occGrid |= (x <= 3) & (x >= 2) & (y <= 10) & (y >= 3)  # Wall 1
+        occGrid |= (x <= 7) & (x >= 6) & (y <= 8) & (y >= 1)  # Wall 2
+        occGrid |= (x <= 10) & (x >= 9) & (y <= 10) & (y >= 3)  # Wall 3
+
+    return(occGrid)
+
+def buildMazeMap(mapHeight = 8, mapWidth = 16):
+    x, y = np.meshgrid(np.arange(1, mapWidth + 1), np.arange(1, mapHeight + 1))
+    occGrid = np.zeros((mapHeight, mapWidth), dtype = bool)
+
+    # Vertical Walls
+    occGrid |= (x == 2) & (y <= 7) & (y >= 5)  # Wall 1
+    occGrid |= (x == 2) & (y <= 3) & (y >= 1)  # Wall 2
+    occGrid |= (x == 5) & (y <= 8) & (y >= 5)  # Wall 3
+    occGrid |= (x == 7) & (y <= 7) & (y >= 2)  # Wall 4
+    occGrid |= (x == 9) & (y <= 7) & (y >= 4)  # Wall 5
+    occGrid |= (x == 11) & (y <= 5) & (y >= 4)  # Wall 6
+    occGrid |= (x == 12) & (y <= 2) & (y >= 1)  # Wall 7
+    occGrid |= (x == 13) & (y <= 7) & (y >= 5)  # Wall 8
+    occGrid |= (x == 16) & (y <= 3) & (y >= 2)  # Wall 9
+    occGrid |= (x == 13) & (y <= 3) & (y >= 2)  # Wall 10
+    occGrid |= (x == 14) & (y <= 3) & (y >= 2)  # Wall 11
+    # Horizontal Walls
+    occGrid |= (x <= 5) & (x >= 2) & (y == 3)  # Wall 1
+    occGrid |= (x <= 5) & (x >= 2) & (y == 5)  # Wall 2
+    occGrid |= (x <= 3) & (x >= 2) & (y == 7)  # Wall 3
+    occGrid |= (x <= 14) & (x >= 9) & (y == 2)  # Wall 4
+    occGrid |= (x <= 11) & (x >= 9) & (y == 4)  # Wall 5
+    occGrid |= (x <= 15) & (x >= 7) & (y == 7)  # Wall 6
+    occGrid |= (x <= 16) & (x >= 13) & (y == 5)  # Wall 7
+
+    return(occGrid)
+
+## ------------------------------------------------------------------------------------------
+#                                     Synthetic Maps
+## ------------------------------------------------------------------------------------------
+
+def randomMap(mapHeight, mapWidth, density = 0.25, seed = 0): # each cell is an obstacle with probability density
+    occGrid = np.random.default_rng(seed).random((mapHeight, mapWidth)) < density
+    occGrid[0, 0] = occGrid[-1, -1] = False   # corners stay free for start and goal
+    return(occGrid)
+
+def mazeMap(mapHeight, mapWidth, spacing = 8, seed = 0):
+
+    '''
+    Rooms of spacing x spacing cells split by one cell walls, every wall between two
+    neighbouring rooms has one door at a random place, so every room can be reached.
+    '''
+
+    rng = np.random.default_rng(seed)
+    occGrid = np.zeros((mapHeight, mapWidth), dtype = bool)
+    occGrid[spacing::spacing + 1, :] = True   # horizontal walls
+    occGrid[:, spacing::spacing + 1] = True   # vertical walls
+
+    roomX = np.arange(0, mapWidth, spacing + 1)
+    for wallY in range(spacing, mapHeight, spacing + 1):   # doors in horizontal walls, one per room above
+        doorX = roomX + (rng.random(len(roomX)) * np.minimum(spacing, mapWidth - roomX)).astype(int)
+        occGrid[wallY, doorX] = False
+    roomY = np.arange(0, mapHeight, spacing + 1)
+    for wallX in range(spacing, mapWidth, spacing + 1):    # doors in vertical walls, one per room to the left
+        doorY = roomY + (rng.random(len(roomY)) * np.minimum(spacing, mapHeight - roomY)).astype(int)
+        occGrid[doorY, wallX] = False
+
+    occGrid[0, 0] = occGrid[-1, -1] = False
+    return(occGrid)
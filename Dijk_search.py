@@ -0,0 +1,732 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Headless Search]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: implement Dijkstra Algorithm on an occupancy grid of any size without any rendering,
+        so the search runs at full speed and the map scripts only draw what it reports
+
+--> Dijkstra uses f = g, total node cost = distance to start node. No heuristic.
+--> A* uses f = g + h, h = octile distance to goal for the 1 / 1.4 step costs (admissible and consistent)
+--> bidirectional Dijkstra grows one tree from the start and one from the goal until they meet
+--> Jump Point Search (Dijk_jps) is A* over jump points only, for 8-connected grids
+--> bucket search (Dial's algorithm) counts costs in tenths, 10 straight and 14 diagonal, so every
+    cost is an exact integer and the queue is a ring of 15 buckets with O(1) push and pop
+--> occGrid[y-1, x-1] is True when cell (x, y) is an obstacle, states are [x, y] from 1
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import heapq
+import time
+from array import array
+import numpy as np
+
+# 8 action steps (dx, dy, cost) in search order --> Up, Right, Down, Left, UpRight, DownRight, UpLeft, DownLeft
+# 4-connected search uses only the first 4 straight steps
+# COST_SCALE turns the step costs into exact integers for the bucket search
+COST_SCALE = 10
+MOVES = ((0, 1, 1), (1, 0, 1), (0, -1, 1), (-1, 0, 1), (1, 1, 1.4), (1, -1, 1.4), (-1, 1, 1.4), (-1, -1, 1.4))
+
+## ------------------------------------------------------------------------------------------
+#                                     Node Class
+## ------------------------------------------------------------------------------------------
+
+class Node:
+
+    '''
+    Attributes:
+        state: state of the node
+        parent: parent of the node
+        c2c: total cost to come
+    '''
+
+    def __init__(self, state, parent, c2c):
+        self.state = state     # current node in the tree
+        self.parent = parent   # parent of current node
+        self.c2c = c2c   # total cost to come
+
+    def __repr__(self):         # special method used to represent a class’s objects as string
+        return(f' state: {self.state}, cost: {self.c2c} ')
+
+    def getNeighbours(self, pos, mapWidth, mapHeight, moves = MOVES): # children for every action step that stays inside the map
+        row, col = pos[0], pos[1]
+        neighbours = []
+        for dx, dy, step in moves:
+            if 1 <= row + dx <= mapWidth and 1 <= col + dy <= mapHeight:
+                neighbours.append(Node([row + dx, col + dy], self, self.c2c + step))
+        return(neighbours)
+
+## ------------------------------------------------------------------------------------------
+#                                     Search Result Class
+## ------------------------------------------------------------------------------------------
+
+class SearchResult:
+
+    '''
+    Attributes:
+        path: list of states from start to goal, empty if the goal cannot be reached
+        cost: total cost to reach the goal, inf if the goal cannot be reached
+        nodesExpanded: number of states popped from the queue and explored
+        nodesDiscovered: number of distinct states that were ever added to the queue
+        stats: SearchStats of the search when findPath was asked to profile it, None otherwise
+    '''
+
+    def __init__(self, path, cost, nodesExpanded, nodesDiscovered, stats = None):
+        self.path = path
+        self.cost = cost
+        self.nodesExpanded = nodesExpanded
+        self.nodesDiscovered = nodesDiscovered
+        self.stats = stats
+
+    def __repr__(self):
+        return(f' cost: {self.cost}, path length: {len(self.path)}, expanded: {self.nodesExpanded}, discovered: {self.nodesDiscovered} ')
+
+## ------------------------------------------------------------------------------------------
+#                                     Search Stats Class
+## ------------------------------------------------------------------------------------------
+
+class SearchStats:
+
+    '''
+    Counters and timers of one profiled search. The searches call push / pop in place of
+    heapq.heappush / heapq.heappop, so an unprofiled search runs no extra code at all.
+    Times are what the wrappers measure. Calling a wrapper costs a little outside its own timers,
+    that part lands in neighbourTime unless timerOverhead = measureTimerOverhead() is passed in.
+
+    Attributes:
+        nodesExpanded: states popped and explored
+        nodesPushed: queue pushes, not counting the entries a queue starts with
+        relaxations: pushes that lowered the cost of a state already in the queue (Case2A), with lazy
+            deletion each one leaves one outdated entry behind
+        nodesPopped: entries popped, outdated ones included
+        stalePops: outdated entries popped and skipped
+        peakOpen: most entries ever held by one queue
+        queueTime: seconds spent in heapq push and pop
+        observerTime: seconds spent in the caller's observer
+        profileTime: seconds the profiling itself added --> counters and timers, plus the extra calls
+            when timerOverhead is known
+        neighbourTime: rest of the search --> neighbour generation, relaxation and setup
+        searchTime: seconds for the whole profiled search, the four times above add up to it
+    '''
+
+    def __init__(self, timerOverhead = None):
+        self.timerOverhead = timerOverhead
+        self.nodesExpanded = 0
+        self.nodesPushed = 0
+        self.relaxations = 0
+        self.nodesPopped = 0
+        self.stalePops = 0
+        self.peakOpen = 0
+        self.queueTime = 0.0
+        self.observerTime = 0.0
+        self.profileTime = 0.0
+        self.neighbourTime = 0.0
+        self.watching = False   # True once watch hands the search an observer of its own
+        self.searchTime = 0.0
+        self.queued = {}   # id of each queue --> keys of the states pushed into it so far
+
+    def __repr__(self):
+        return(f' expanded: {self.nodesExpanded}, pushed: {self.nodesPushed}, relaxations: {self.relaxations}, '
+               f'stale pops: {self.stalePops}, peak open: {self.peakOpen}, queue: {self.queueTime:.4f}s, '
+               f'neighbours: {self.neighbourTime:.4f}s, profiling: {self.profileTime:.4f}s, total: {self.searchTime:.4f}s ')
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Wrapper Functions
+    ## --------------------------------------------------------------------------------------
+
+    # every wrapper times its heap operation or observer call apart from its own bookkeeping, the
+    # bookkeeping goes to profileTime so it is never reported as neighbour generation
+
+    def push(self, queue, entry): # heapq.heappush that counts and times, entry[-1] is the cell id or Node
+        begin = time.perf_counter()
+        heapq.heappush(queue, entry)
+        pushed = time.perf_counter()
+        self.queueTime += pushed - begin
+        self.countPush(queue, entry)
+        self.profileTime += time.perf_counter() - pushed
+
+    def pop(self, queue): # heapq.heappop that counts and times
+        begin = time.perf_counter()
+        entry = heapq.heappop(queue)
+        popped = time.perf_counter()
+        self.queueTime += popped - begin
+        self.countPop(entry)
+        self.profileTime += time.perf_counter() - popped
+        return(entry)
+
+    def watch(self, observer): # observer for the search --> reports each expansion, times the caller's observer apart
+        if observer is None and type(self).expand is SearchStats.expand:
+            return(None)    # nothing to report to, the search runs without an observer as it would unprofiled
+        self.watching = True
+        def timedObserver(state):
+            begin = time.perf_counter()
+            self.expand(state)
+            watched = 0.0
+            if observer is not None:
+                called = time.perf_counter()
+                observer(state)
+                watched = time.perf_counter() - called
+                self.observerTime += watched
+            self.profileTime += time.perf_counter() - begin - watched
+        return(timedObserver)
+
+    def countPush(self, queue, entry): # bookkeeping of one push
+        self.nodesPushed += 1
+        self.peakOpen = max(self.peakOpen, len(queue))
+        key = tuple(entry[-1].state) if isinstance(entry[-1], Node) else int(entry[-1])
+        queued = self.queued.setdefault(id(queue), set())
+        if key in queued:   # lazy deletion --> the cell was never popped, its older entry is still queued
+            self.relaxations += 1
+        queued.add(key)
+
+    def countPop(self, entry): # bookkeeping of one pop
+        self.nodesPopped += 1
+
+    def expand(self, state): # called with every expanded state, for subclasses that record the search
+        pass
+
+    def finish(self, result, searchTime): # fill in what is only known once the search is done
+        self.queued = {}
+        self.nodesExpanded = result.nodesExpanded
+        self.stalePops = self.nodesPopped - result.nodesExpanded
+        self.searchTime = searchTime
+
+        # what the wrapper timers cannot see (the calls themselves, half of each timer read, the state
+        # built for the observer) moves from queueTime and the rest of the search to profileTime
+        if self.timerOverhead is not None:
+            unseenQueue, timerBias, unseenObserver = self.timerOverhead
+            queueCalls = self.nodesPushed + self.nodesPopped
+            self.queueTime = max(0.0, self.queueTime - queueCalls * timerBias)
+            self.profileTime += queueCalls * (timerBias + unseenQueue)
+            if self.watching:
+                self.profileTime += result.nodesExpanded * unseenObserver
+        self.neighbourTime = max(0.0, searchTime - self.queueTime - self.observerTime - self.profileTime)
+        result.stats = self
+        return(result)
+
+def measureTimerOverhead(numCalls = 20000):
+
+    '''
+    Time the SearchStats wrappers against bare heapq on this machine, for SearchStats(timerOverhead = ...).
+    Returns (seconds a push or pop costs outside its own timers, seconds its first timer adds to
+    queueTime, seconds an observer call costs outside its timers, building the state included).
+    Runs the benchmark three times (about half a second with the default numCalls), so measure once
+    and pass the same result to every SearchStats that should use it.
+    '''
+
+    runs = sorted((timeWrappers(numCalls) for _ in range(3)), key = lambda run: sum(run))
+    return(runs[1])   # median run, a single core machine can be interrupted in any one of them
+
+def timeWrappers(numCalls): # the same pushes, pops and expansions once through SearchStats and once bare
+    entries = [(cellId * 7919 % numCalls, -cellId, cellId % (numCalls // 2)) for cellId in range(numCalls)]
+    wallTimes = []
+    stats, watcher = SearchStats(), SearchStats()
+    for profiled in (False, True):
+        push, pop = (stats.push, stats.pop) if profiled else (heapq.heappush, heapq.heappop)
+        observer = watcher.watch(lambda state: None) if profiled else None
+        queue = []
+        begin = time.perf_counter()
+        for entry in entries:
+            push(queue, entry)
+        while queue != []:
+            pop(queue)
+        queued = time.perf_counter()
+        for cellId in range(numCalls):
+            if observer is not None:
+                observer(toState(cellId, 100))
+        wallTimes.append((queued - begin, time.perf_counter() - queued))
+    (bareQueue, bareLoop), (queueTotal, observerTotal) = wallTimes
+    unseenQueue = (queueTotal - stats.queueTime - stats.profileTime) / (2 * numCalls)
+    timerBias = (stats.queueTime - bareQueue) / (2 * numCalls)
+    unseenObserver = (observerTotal - bareLoop - watcher.profileTime - watcher.observerTime) / numCalls
+    return((max(0.0, unseenQueue), max(0.0, timerBias), max(0.0, unseenObserver)))
+
+## ------------------------------------------------------------------------------------------
+#                                         Dijkstra Function
+## ------------------------------------------------------------------------------------------
+
+def findPath(occGrid, s, g, observer = None, storage = 'compact', connectivity = 8, moveMasks = None, method = 'dijkstra',
+             profile = False, statsCallback = None):
+
+    '''
+    Search for the lowest cost path from s to g on occGrid.
+    observer, if given, is called with the state of every node popped from the queue
+    (start and goal included), e.g. to draw the search as it runs.
+    storage picks how the search tree is kept:
+        'compact': cost to come and parent live in flat arrays indexed by cell id
+        'node': one Node object per discovered child, parents chained through Node.parent
+    connectivity is 8 (straight and diagonal steps) or 4 (straight steps only).
+    moveMasks can be passed in from buildMoveMasks(occGrid, connectivity) to reuse it across
+    queries on the same map, otherwise the compact search builds it for this call.
+    method is 'dijkstra', 'astar', 'bidirectional', 'jps' or 'bucket', all return a lowest cost path.
+    'bidirectional' and 'bucket' only support the compact storage, 'jps' keeps its own and needs connectivity 8.
+    profile = True records a SearchStats on result.stats, or fills the SearchStats passed as profile
+    (e.g. a Dijk_trace.TraceRecorder, or SearchStats(measureTimerOverhead()) for calibrated times). statsCallback, if given, is called with it after the search
+    (and turns profiling on). 'bucket' has no heap to profile and cannot be profiled.
+    '''
+
+    checkState(s, occGrid, "Start")
+    checkState(g, occGrid, "Goal")
+
+    moves = getMoves(connectivity)
+    if method not in ('dijkstra', 'astar', 'bidirectional', 'jps', 'bucket'):
+        raise ValueError(f"Unknown search method: {method}")
+    if storage not in ('compact', 'node'):
+        raise ValueError(f"Unknown storage mode: {storage}")
+    if not profile and statsCallback is None:
+        return(runSearch(occGrid, s, g, observer, storage, connectivity, moveMasks, method, moves, None))
+
+    if method == 'bucket':
+        raise ValueError("Bucket search cannot be profiled")
+    stats = profile if isinstance(profile, SearchStats) else SearchStats()
+    observer = stats.watch(observer)
+    begin = time.perf_counter()
+    result = runSearch(occGrid, s, g, observer, storage, connectivity, moveMasks, method, moves, stats)
+    stats.finish(result, time.perf_counter() - begin)
+    if statsCallback is not None:
+        statsCallback(stats)
+    return(result)
+
+def runSearch(occGrid, s, g, observer, storage, connectivity, moveMasks, method, moves, stats): # hand the query to the engine picked by findPath
+    useHeuristic = method == 'astar'
+    if method == 'jps':
+        if connectivity != 8:
+            raise ValueError("Jump Point Search needs connectivity 8")
+        from Dijk_jps import jumpPointSearch   # imported here, Dijk_jps builds on this module
+        return(jumpPointSearch(occGrid, s, g, observer, stats))
+    if method == 'bidirectional':
+        if storage != 'compact':
+            raise ValueError("Bidirectional search needs compact storage")
+        return(bidirectionalSearch(occGrid, s, g, observer, connectivity, moveMasks, stats))
+    if method == 'bucket':
+        if storage != 'compact':
+            raise ValueError("Bucket search needs compact storage")
+        return(bucketSearch(occGrid, s, g, observer, connectivity, moveMasks))
+    if storage == 'compact':
+        return(compactSearch(occGrid, s, g, observer, connectivity, moveMasks, useHeuristic, stats))
+    return(nodeSearch(occGrid, s, g, observer, moves, useHeuristic, connectivity, stats))
+
+def nodeSearch(occGrid, s, g, observer = None, moves = MOVES, useHeuristic = False, connectivity = 8, stats = None):
+    mapHeight, mapWidth = occGrid.shape
+    push, pop = (stats.push, stats.pop) if stats is not None else (heapq.heappush, heapq.heappop)
+    startNode = Node(list(s), None, 0)
+    goalNode = Node(list(g), None, float('inf'))
+
+    queue = []                    # heap of (f, order, node) --> lowest f is always on top
+    costs = {}                    # best known cost to come of every discovered state
+    closed = set()                # states whose cost to come is final
+    order = 0                     # tie breaker, equal f are explored first in first out (Dijkstra) or last in first out (A*)
+    orderStep = -1 if useHeuristic else 1
+    queue.append((0, order, startNode))   # add start node to queue
+    costs[tuple(startNode.state)] = startNode.c2c
+
+    while queue != []:
+        currentNode = pop(queue)[2]             # pop node with lowest cost
+        if tuple(currentNode.state) in closed:            # stale entry, state was already explored at a lower cost
+            continue
+        closed.add(tuple(currentNode.state))
+        if observer is not None:
+            observer(currentNode.state)
+
+        # Case 1 --> Goal Reached
+        if currentNode.state == goalNode.state:
+            path = backtrack(currentNode, startNode)[::-1]   # reversed --> list is start to goal
+            return(SearchResult(path, currentNode.c2c, len(closed), len(costs)))
+
+        # Case 2: goal not reached, evaluate neighbours to popped current node
+        Neighbours = currentNode.getNeighbours(currentNode.state, mapWidth, mapHeight, moves)
+        for child in Neighbours:
+            childKey = tuple(child.state)
+            if not isObstacle(child.state, occGrid) and childKey not in closed:
+                # Case2A: previosly discovered, push again only if cheaper (lazy decrease-key)
+                # Case2B: add to queue, previosly not discovered
+                if child.c2c < costs.get(childKey, float('inf')):
+                    costs[childKey] = child.c2c
+                    order += orderStep
+                    priority = child.c2c + octileDistance(child.state, g, connectivity) if useHeuristic else child.c2c
+                    push(queue, (priority, order, child))
+
+    # queue exhausted --> goal cannot be reached from start
+    return(SearchResult([], float('inf'), len(closed), len(costs)))
+
+def compactSearch(occGrid, s, g, observer = None, connectivity = 8, moveMasks = None, useHeuristic = False, stats = None):
+    mapHeight, mapWidth = occGrid.shape
+    push, pop = (stats.push, stats.pop) if stats is not None else (heapq.heappush, heapq.heappop)
+    numCells = mapHeight * mapWidth
+    moveTable = buildMoveTable(mapWidth, connectivity)
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    legalMoves = memoryview(moveMasks.reshape(-1))
+
+    # states are packed into cell ids --> cellId = (y-1)*mapWidth + (x-1)
+    c2c = array('d', [float('inf')]) * numCells    # cost to come of every cell
+    parent = array('i', [-1]) * numCells           # cell id of the parent, -1 for none
+    closed = bytearray(numCells)                   # 1 once the cost to come of a cell is final
+    startId, goalId = toCellId(s, mapWidth), toCellId(g, mapWidth)
+
+    queue = [(0.0, 0, startId)]   # heap of (f, order, cellId) --> lowest f is always on top
+    c2c[startId] = 0.0
+    order = 0                     # tie breaker, equal f are explored first in first out (Dijkstra) or last in first out (A*)
+    orderStep = -1 if useHeuristic else 1
+    goalX, goalY = goalId % mapWidth, goalId // mapWidth
+    diagonalSaving = 1.4 - 2 if connectivity == 8 else 0   # octile = dx + dy - 0.6 * min(dx, dy), manhattan for 4 steps
+    nodesExpanded, nodesDiscovered = 0, 1
+
+    while queue != []:
+        current = pop(queue)[2]
+        if closed[current]:       # stale entry, cell was already explored at a lower cost
+            continue
+        closed[current] = 1
+        cost = c2c[current]
+        nodesExpanded += 1
+        if observer is not None:
+            observer(toState(current, mapWidth))
+
+        # Case 1 --> Goal Reached
+        if current == goalId:
+            path = [toState(cellId, mapWidth) for cellId in backtrackIds(parent, current)]
+            return(SearchResult(path, cost, nodesExpanded, nodesDiscovered))
+
+        # Case 2: goal not reached, relax every legal move of the current cell
+        mask = legalMoves[current]
+        for bit, delta, step in moveTable:
+            if not mask & bit:
+                continue
+            child = current + delta
+            if closed[child]:
+                continue
+            childCost = cost + step
+            if childCost < c2c[child]:
+                if c2c[child] == float('inf'):
+                    nodesDiscovered += 1
+                c2c[child] = childCost
+                parent[child] = current
+                order += orderStep
+                if useHeuristic:
+                    dx, dy = abs(child % mapWidth - goalX), abs(child // mapWidth - goalY)
+                    push(queue, (childCost + dx + dy + diagonalSaving * min(dx, dy), order, child))
+                else:
+                    push(queue, (childCost, order, child))
+
+    # queue exhausted --> goal cannot be reached from start
+    return(SearchResult([], float('inf'), nodesExpanded, nodesDiscovered))
+
+def bidirectionalSearch(occGrid, s, g, observer = None, connectivity = 8, moveMasks = None, stats = None):
+
+    '''
+    Dijkstra from s and from g at the same time, always expanding the side with the lower queue top.
+    best is the cheapest start --> meet --> goal path seen so far, it is optimal as soon as
+    top of forward queue + top of backward queue >= best. Steps cost the same both ways, so the
+    backward tree uses the same move masks.
+    '''
+
+    mapHeight, mapWidth = occGrid.shape
+    numCells = mapHeight * mapWidth
+    moveTable = buildMoveTable(mapWidth, connectivity)
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    legalMoves = memoryview(moveMasks.reshape(-1))
+    startId, goalId = toCellId(s, mapWidth), toCellId(g, mapWidth)
+    push, pop = (stats.push, stats.pop) if stats is not None else (heapq.heappush, heapq.heappop)
+
+    # index 0 --> tree grown from start, index 1 --> tree grown from goal
+    c2c = (array('d', [float('inf')]) * numCells, array('d', [float('inf')]) * numCells)
+    parent = (array('i', [-1]) * numCells, array('i', [-1]) * numCells)
+    closed = (bytearray(numCells), bytearray(numCells))
+    queues = ([(0.0, 0, startId)], [(0.0, 0, goalId)])
+    c2c[0][startId], c2c[1][goalId] = 0.0, 0.0
+    order = 0
+    best, meet = (0.0, startId) if startId == goalId else (float('inf'), -1)
+    nodesExpanded, nodesDiscovered = 0, 1 if startId == goalId else 2
+
+    while queues[0] != [] and queues[1] != []:
+        if queues[0][0][0] + queues[1][0][0] >= best:   # no cheaper meeting point is left
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        cost, _, current = pop(queues[side])
+        sideC2c, sideParent, sideClosed, otherC2c = c2c[side], parent[side], closed[side], c2c[1 - side]
+        if sideClosed[current]:       # stale entry, cell was already explored at a lower cost
+            continue
+        sideClosed[current] = 1
+        nodesExpanded += 1
+        if observer is not None:
+            observer(toState(current, mapWidth))
+
+        mask = legalMoves[current]
+        for bit, delta, step in moveTable:
+            if not mask & bit:
+                continue
+            child = current + delta
+            childCost = cost + step
+            if not sideClosed[child] and childCost < sideC2c[child]:
+                if sideC2c[child] == float('inf') and otherC2c[child] == float('inf'):
+                    nodesDiscovered += 1
+                sideC2c[child] = childCost
+                sideParent[child] = current
+                order += 1
+                push(queues[side], (childCost, order, child))
+            if sideC2c[child] + otherC2c[child] < best:   # the two trees touch at child
+                best, meet = sideC2c[child] + otherC2c[child], child
+
+    # Case 1 --> trees never met, goal cannot be reached from start
+    if meet == -1:
+        return(SearchResult([], float('inf'), nodesExpanded, nodesDiscovered))
+
+    # Case 2 --> start ... meet from the forward tree, then meet ... goal from the backward tree
+    pathIds = backtrackIds(parent[0], meet) + backtrackIds(parent[1], meet)[::-1][1:]
+    path = [toState(cellId, mapWidth) for cellId in pathIds]
+    return(SearchResult(path, best, nodesExpanded, nodesDiscovered))
+
+def bucketSearch(occGrid, s, g, observer = None, connectivity = 8, moveMasks = None):
+
+    '''
+    Dijkstra with integer costs (COST_SCALE per unit) and a circular bucket queue (Dial's algorithm).
+    Bucket i holds the cells whose cost to come is i modulo the number of buckets, with one more
+    bucket than the largest step cost every pushed cell lands in a bucket that is not being emptied.
+    '''
+
+    mapHeight, mapWidth = occGrid.shape
+    numCells = mapHeight * mapWidth
+    moveTable = tuple((bit, delta, round(step * COST_SCALE)) for bit, delta, step in buildMoveTable(mapWidth, connectivity))
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    legalMoves = memoryview(moveMasks.reshape(-1))
+
+    unreached = numCells * max(step for _, _, step in moveTable) + 1   # larger than any path cost
+    c2c = array('q', [unreached]) * numCells       # cost to come of every cell in 1 / COST_SCALE units
+    parent = array('i', [-1]) * numCells
+    closed = bytearray(numCells)
+    startId, goalId = toCellId(s, mapWidth), toCellId(g, mapWidth)
+
+    numBuckets = max(step for _, _, step in moveTable) + 1
+    buckets = [[] for _ in range(numBuckets)]
+    buckets[0].append(startId)
+    c2c[startId] = 0
+    cost, queued = 0, 1            # cost of the bucket being emptied, entries left in all buckets
+    nodesExpanded, nodesDiscovered = 0, 1
+
+    while queued:
+        bucket = buckets[cost % numBuckets]
+        while bucket != []:
+            current = bucket.pop()
+            queued -= 1
+            if closed[current] or c2c[current] != cost:   # stale entry, cell was already explored at a lower cost
+                continue
+            closed[current] = 1
+            nodesExpanded += 1
+            if observer is not None:
+                observer(toState(current, mapWidth))
+
+            # Case 1 --> Goal Reached
+            if current == goalId:
+                path = [toState(cellId, mapWidth) for cellId in backtrackIds(parent, current)]
+                return(SearchResult(path, cost / COST_SCALE, nodesExpanded, nodesDiscovered))
+
+            # Case 2: goal not reached, relax every legal move of the current cell
+            mask = legalMoves[current]
+            for bit, delta, step in moveTable:
+                if not mask & bit:
+                    continue
+                child = current + delta
+                childCost = cost + step
+                if not closed[child] and childCost < c2c[child]:
+                    if c2c[child] == unreached:
+                        nodesDiscovered += 1
+                    c2c[child] = childCost
+                    parent[child] = current
+                    buckets[childCost % numBuckets].append(child)
+                    queued += 1
+        cost += 1
+
+    # queue exhausted --> goal cannot be reached from start
+    return(SearchResult([], float('inf'), nodesExpanded, nodesDiscovered))
+
+def fullSearch(occGrid, sources, connectivity = 8, moveMasks = None):
+
+    '''
+    Dijkstra from every state in sources at once, run until the queue is empty.
+    Returns flat arrays indexed by cell id: cost to come (inf where unreachable) and
+    parent cell id (-1 for sources and unreachable cells).
+    '''
+
+    mapHeight, mapWidth = occGrid.shape
+    numCells = mapHeight * mapWidth
+    moveTable = buildMoveTable(mapWidth, connectivity)
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    legalMoves = memoryview(moveMasks.reshape(-1))
+
+    c2c = array('d', [float('inf')]) * numCells
+    parent = array('i', [-1]) * numCells
+    closed = bytearray(numCells)
+
+    queue = []
+    for state in sources:
+        checkState(state, occGrid, "Source")
+        sourceId = toCellId(state, mapWidth)
+        c2c[sourceId] = 0.0
+        queue.append((0.0, sourceId))
+    heapq.heapify(queue)
+
+    while queue != []:
+        cost, current = heapq.heappop(queue)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        mask = legalMoves[current]
+        for bit, delta, step in moveTable:
+            if not mask & bit:
+                continue
+            child = current + delta
+            childCost = cost + step
+            if childCost < c2c[child]:
+                c2c[child] = childCost
+                parent[child] = current
+                heapq.heappush(queue, (childCost, child))
+
+    return(c2c, parent)
+
+def findNearest(occGrid, starts, goals, observer = None, connectivity = 8, moveMasks = None):
+
+    '''
+    Lowest cost path from any state in starts to the nearest state in goals, in one search.
+    Dijkstra starts from every start at once and stops at the first goal popped, so
+    result.path[0] is the start used and result.path[-1] the goal reached.
+    Steps cost the same both ways, so one start and many goals or many starts and one goal both work.
+    '''
+
+    starts, goals = [list(state) for state in starts], [list(state) for state in goals]
+    if starts == [] or goals == []:
+        raise ValueError("findNearest needs at least one start and one goal")
+    for state in starts:
+        checkState(state, occGrid, "Start")
+    for state in goals:
+        checkState(state, occGrid, "Goal")
+
+    mapHeight, mapWidth = occGrid.shape
+    numCells = mapHeight * mapWidth
+    moveTable = buildMoveTable(mapWidth, connectivity)
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    legalMoves = memoryview(moveMasks.reshape(-1))
+
+    c2c = array('d', [float('inf')]) * numCells
+    parent = array('i', [-1]) * numCells
+    closed = bytearray(numCells)
+    isGoal = bytearray(numCells)
+    for state in goals:
+        isGoal[toCellId(state, mapWidth)] = 1
+
+    queue = []
+    order = 0
+    for state in starts:
+        startId = toCellId(state, mapWidth)
+        if c2c[startId] != 0.0:
+            c2c[startId] = 0.0
+            order += 1
+            queue.append((0.0, order, startId))
+    nodesExpanded, nodesDiscovered = 0, len(queue)
+
+    while queue != []:
+        cost, _, current = heapq.heappop(queue)
+        if closed[current]:       # stale entry, cell was already explored at a lower cost
+            continue
+        closed[current] = 1
+        nodesExpanded += 1
+        if observer is not None:
+            observer(toState(current, mapWidth))
+
+        # Case 1 --> nearest goal reached
+        if isGoal[current]:
+            path = [toState(cellId, mapWidth) for cellId in backtrackIds(parent, current)]
+            return(SearchResult(path, cost, nodesExpanded, nodesDiscovered))
+
+        # Case 2: no goal yet, relax every legal move of the current cell
+        mask = legalMoves[current]
+        for bit, delta, step in moveTable:
+            if not mask & bit:
+                continue
+            child = current + delta
+            childCost = cost + step
+            if not closed[child] and childCost < c2c[child]:
+                if c2c[child] == float('inf'):
+                    nodesDiscovered += 1
+                c2c[child] = childCost
+                parent[child] = current
+                order += 1
+                heapq.heappush(queue, (childCost, order, child))
+
+    # queue exhausted --> no goal can be reached from any start
+    return(SearchResult([], float('inf'), nodesExpanded, nodesDiscovered))
+
+## ------------------------------------------------------------------------------------------
+#                                  Helper Functions
+## ------------------------------------------------------------------------------------------
+
+def backtrack(current, start):
+    backtrackList = [current.state]   # new list to collect backtracked list
+    while(current.state != start.state):
+        current = current.parent
+        backtrackList.append(current.state)
+    return(backtrackList)
+
+def octileDistance(a, b, connectivity = 8): # lowest possible cost between states a and b on an empty map
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    if connectivity == 8:
+        return(max(dx, dy) + 0.4 * min(dx, dy))
+    return(dx + dy)
+
+def getMoves(connectivity): # action steps for 4- or 8-connected grids
+    if connectivity == 8:
+        return(MOVES)
+    elif connectivity == 4:
+        return(MOVES[:4])
+    else:
+        raise ValueError(f"connectivity must be 4 or 8, not {connectivity}")
+
+def buildMoveTable(mapWidth, connectivity = 8): # (mask bit, cell id offset, cost) of every action step
+    return(tuple((1 << bit, dy * mapWidth + dx, step) for bit, (dx, dy, step) in enumerate(getMoves(connectivity))))
+
+def buildMoveMasks(occGrid, connectivity = 8):
+
+    '''
+    Per cell bitmask of legal moves, bit i is set when action step i from that cell stays inside
+    the map and lands on a free cell. Obstacle cells get no moves. Same shape as occGrid, uint8.
+    '''
+
+    mapHeight, mapWidth = occGrid.shape
+    free = ~np.asarray(occGrid, dtype = bool)
+    moveMasks = np.zeros((mapHeight, mapWidth), dtype = np.uint8)
+    for bit, (dx, dy, _) in enumerate(getMoves(connectivity)):
+        rows, cols = slice(max(0, -dy), mapHeight - max(0, dy)), slice(max(0, -dx), mapWidth - max(0, dx))   # cells whose move stays in map
+        toRows, toCols = slice(max(0, dy), mapHeight + min(0, dy)), slice(max(0, dx), mapWidth + min(0, dx))  # cells they move to
+        moveMasks[rows, cols] |= free[toRows, toCols].astype(np.uint8) << bit
+    moveMasks[~free] = 0
+    return(moveMasks)
+
+def backtrackIds(parent, current): # follow parent ids back to the start --> list is start to goal
+    backtrackList = [current]
+    while parent[current] != -1:
+        current = parent[current]
+        backtrackList.append(current)
+    return(backtrackList[::-1])
+
+def checkState(state, occGrid, name): # raise if state is outside the map or inside an obstacle
+    mapHeight, mapWidth = occGrid.shape
+    if not (1 <= state[0] <= mapWidth and 1 <= state[1] <= mapHeight):
+        raise ValueError(f"{name} Node outside Map: {state}")
+    if isObstacle(state, occGrid):
+        raise ValueError(f"{name} Node inside obstacle: {state}")
+
+def isObstacle(state, occGrid): # O(1) obstacle lookup for cell [x, y]
+    return(bool(occGrid[state[1] - 1, state[0] - 1]))
+
+def toCellId(state, mapWidth): # pack [x, y] into a single integer cell id
+    return((state[1] - 1) * mapWidth + (state[0] - 1))
+
+def toState(cellId, mapWidth): # unpack a cell id into [x, y]
+    return([cellId % mapWidth + 1, cellId // mapWidth + 1])
@@ -0,0 +1,194 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Path Query Server]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: serve path queries over a local TCP or Unix socket with asyncio, maps stay loaded between
+        queries and searches run in a process pool so the event loop never waits on one
+
+--> one JSON object per line both ways, request:
+        {"id": 1, "map": "maze", "start": [3, 6], "goal": [16, 1], "method": "astar", "connectivity": 8}
+    response: {"id": 1, "path": [[3, 6], ...], "cost": 27.4, "nodesExpanded": 43}, cost null when
+    the goal cannot be reached, {"id": 1, "error": "..."} for a bad query
+--> identical queries that arrive while one is being solved share that one search
+--> every request on a connection is answered as soon as it is solved, match answers by "id"
+--> usage: python Dijk_server.py --port 8765 --map site=site.npy
+           python Dijk_server.py --unix /tmp/planner.sock
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from Dijk_mapFile import loadMap
+from Dijk_maps import buildEmptyMap, buildMazeMap, buildObstacleMap
+from Dijk_search import buildMoveMasks, checkState, findPath, getMoves
+
+# maps every server knows, by name --> builder
+BUILTIN_MAPS = {
+    'empty': buildEmptyMap,
+    'obstacle1': lambda: buildObstacleMap(1),
+    'obstacle2': lambda: buildObstacleMap(2),
+    'maze': buildMazeMap,
+}
+METHODS = ('dijkstra', 'astar', 'bidirectional', 'jps', 'bucket')
+
+# maps opened once per worker process, (map name, connectivity) --> move masks built on first use
+workerMaps = {}
+workerMasks = {}
+
+## ------------------------------------------------------------------------------------------
+#                                     Path Server Class
+## ------------------------------------------------------------------------------------------
+
+class PathServer:
+
+    '''
+    Attributes:
+        maps: map name --> occupancy grid, the built in maps plus mapFiles (name --> .npy or .pgm file)
+        queriesSolved: searches run by the worker pool
+        queriesCoalesced: queries answered by a search another query had already started
+    '''
+
+    def __init__(self, mapFiles = None, workers = None):
+        self.mapFiles = dict(mapFiles or {})
+        self.maps = openMaps(self.mapFiles)   # the parent keeps them to check queries before queuing them
+        # spawned, not forked --> a forked worker would hold on to the client sockets open at the time
+        # and keep those connections from closing
+        self.pool = ProcessPoolExecutor(max_workers = workers, mp_context = multiprocessing.get_context('spawn'),
+                                        initializer = attachMaps, initargs = (self.mapFiles,))
+        self.running = {}   # query key --> future of the search solving it
+        self.queriesSolved = 0
+        self.queriesCoalesced = 0
+
+    def __repr__(self):
+        return(f' maps: {list(self.maps)}, solved: {self.queriesSolved}, coalesced: {self.queriesCoalesced} ')
+
+    async def serve(self, host = '127.0.0.1', port = 8765, unixPath = None): # run until cancelled
+        if unixPath is not None:
+            server = await asyncio.start_unix_server(self.handleClient, path = unixPath)
+        else:
+            server = await asyncio.start_server(self.handleClient, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures = True)
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Query Functions
+    ## --------------------------------------------------------------------------------------
+
+    async def query(self, request): # answer one decoded request, ValueError for a bad one
+
+        mapName = request.get('map')
+        if not isinstance(mapName, str) or mapName not in self.maps:
+            raise ValueError(f"Unknown map: {mapName}")
+        s, g = parseState(request.get('start'), "start"), parseState(request.get('goal'), "goal")
+        method, connectivity = request.get('method', 'dijkstra'), request.get('connectivity', 8)
+        if not isinstance(method, str) or method not in METHODS:
+            raise ValueError(f"Unknown search method: {method}")
+        if not isinstance(connectivity, int) or isinstance(connectivity, bool):
+            raise ValueError(f"connectivity must be an integer, not {connectivity}")
+        getMoves(connectivity)
+        checkState(s, self.maps[mapName], "Start")
+        checkState(g, self.maps[mapName], "Goal")
+
+        # Case 1 --> same query already being solved, wait for that search
+        key = (mapName, tuple(s), tuple(g), method, connectivity)
+        future = self.running.get(key)
+        if future is not None:
+            self.queriesCoalesced += 1
+        # Case 2 --> hand the search to the pool
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.pool, solveQuery, mapName, s, g, method, connectivity)
+            self.running[key] = future
+            future.add_done_callback(lambda _: self.running.pop(key, None))
+            self.queriesSolved += 1
+        return(await asyncio.shield(future))   # a client that goes away does not cancel the search for the others
+
+    async def answer(self, line, writer): # decode, solve and write back one request line
+        requestId = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            requestId = request.get('id')
+            response = await self.query(request)
+        except ValueError as error:
+            response = {'error': str(error)}
+        except Exception as error:   # anything else still gets an answer, a client is never left waiting on its id
+            response = {'error': f"{type(error).__name__}: {error}"}
+        writer.write(json.dumps({'id': requestId, **response}).encode() + b'\n')
+        await writer.drain()
+
+    async def handleClient(self, reader, writer):
+        answers = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(self.answer(line, writer))
+                    answers.add(task)
+                    task.add_done_callback(answers.discard)
+            await asyncio.gather(*answers, return_exceptions = True)
+        finally:
+            writer.close()
+
+## ------------------------------------------------------------------------------------------
+#                                  Worker Functions
+## ------------------------------------------------------------------------------------------
+
+def openMaps(mapFiles): # built in maps plus one per (name, file), .npy files are memory mapped
+    maps = {name: build() for name, build in BUILTIN_MAPS.items()}
+    for name, fileName in mapFiles.items():
+        maps[name] = loadMap(fileName)
+    return(maps)
+
+def attachMaps(mapFiles): # pool initializer --> open every map once per worker
+    workerMaps.update(openMaps(mapFiles))
+
+def solveQuery(mapName, s, g, method, connectivity): # runs in a worker, returns the JSON ready answer
+    occGrid = workerMaps[mapName]
+    if (mapName, connectivity) not in workerMasks:
+        workerMasks[(mapName, connectivity)] = buildMoveMasks(occGrid, connectivity)
+    result = findPath(occGrid, s, g, connectivity = connectivity, moveMasks = workerMasks[(mapName, connectivity)], method = method)
+    return({'path': result.path, 'cost': result.cost if math.isfinite(result.cost) else None, 'nodesExpanded': result.nodesExpanded})
+
+def parseState(value, name): # [x, y] of ints from a decoded request
+    if not (isinstance(value, list) and len(value) == 2 and all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{name} must be [x, y] with integer x and y, not {value}")
+    return(value)
+
+## ------------------------------------------------------------------------------------------
+#                                       Main Function
+## ------------------------------------------------------------------------------------------
+
+if __name__== "__main__":
+
+    parser = argparse.ArgumentParser(description = "Serve path queries over a local socket")
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--unix', help = "listen on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type = int, help = "search processes, os.cpu_count() when left out")
+    parser.add_argument('--map', action = 'append', default = [], metavar = 'NAME=FILE', help = "extra map to load, .npy or .pgm")
+    args = parser.parse_args()
+
+    mapFiles = dict(spec.split('=', 1) for spec in args.map)
+    server = PathServer(mapFiles, args.workers)
+    print("Serving maps", list(server.maps), "on", args.unix or f"{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
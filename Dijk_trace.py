@@ -0,0 +1,213 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Search Traces]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: record a search once at full speed into a compact binary trace, then replay it in the
+        pygame view at any speed or from any step without running the search again
+
+--> TraceRecorder is a SearchStats, pass it as findPath(..., profile = recorder)
+--> one event per expansion, per push (relaxation) and per path cell: kind (1 byte), cell id (4 bytes)
+    and cost (4 byte float), 9 bytes per event. Pushes and expansions carry the queue priority
+    (cost to come, plus the heuristic for A*), path cells carry the cost to come along the path
+--> file layout: header, map packed 8 cells per byte, events
+--> usage: python Dijk_trace.py search.trace --speed 2000 --start 500 --headless --frames frames
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import argparse
+import struct
+import time
+from array import array
+import numpy as np
+from Dijk_search import Node, SearchStats, toCellId, toState
+
+# event kinds
+EXPAND, RELAX, PATH = 0, 1, 2
+EVENT_DTYPE = np.dtype([('kind', 'u1'), ('cell', '<u4'), ('cost', '<f4')])
+HEADER = struct.Struct('<4sBIIQd')   # magic, version, mapHeight, mapWidth, number of events, path cost
+MAGIC, VERSION = b'DJTR', 1
+RELAXED_COLOUR = (70, 70, 140)
+
+## ------------------------------------------------------------------------------------------
+#                                     Trace Recorder Class
+## ------------------------------------------------------------------------------------------
+
+class TraceRecorder(SearchStats):
+
+    '''
+    SearchStats that also keeps every expansion, push and path cell of the search, in order.
+    Record with findPath(occGrid, s, g, profile = recorder), then recorder.save(fileName).
+    '''
+
+    def __init__(self, occGrid, timerOverhead = None):
+        super().__init__(timerOverhead)
+        self.occGrid = np.asarray(occGrid, dtype = bool)
+        self.mapWidth = self.occGrid.shape[1]
+        self.kinds = array('B')
+        self.cells = array('I')
+        self.costs = array('f')
+        self.lastPriority = 0.0
+        self.pathCost = float('inf')
+
+    def countPush(self, queue, entry):
+        super().countPush(queue, entry)
+        cell = toCellId(entry[-1].state, self.mapWidth) if isinstance(entry[-1], Node) else int(entry[-1])
+        self.record(RELAX, cell, entry[0])
+
+    def countPop(self, entry):
+        super().countPop(entry)
+        self.lastPriority = entry[0]   # the next expansion is this entry unless it is stale
+
+    def expand(self, state):
+        self.record(EXPAND, toCellId(state, self.mapWidth), self.lastPriority)
+
+    def finish(self, result, searchTime):
+        super().finish(result, searchTime)
+        cost = 0.0
+        for i, state in enumerate(result.path):
+            if i > 0:
+                cost += 1.4 if state[0] != result.path[i - 1][0] and state[1] != result.path[i - 1][1] else 1
+            self.record(PATH, toCellId(state, self.mapWidth), cost)
+        self.pathCost = result.cost
+        return(result)
+
+    def record(self, kind, cell, cost):
+        self.kinds.append(kind)
+        self.cells.append(cell)
+        self.costs.append(cost)
+
+    def save(self, fileName):
+        events = np.empty(len(self.kinds), dtype = EVENT_DTYPE)
+        events['kind'] = np.frombuffer(self.kinds, dtype = np.uint8)
+        events['cell'] = np.frombuffer(self.cells, dtype = np.uint32)
+        events['cost'] = np.frombuffer(self.costs, dtype = np.float32)
+        mapHeight, mapWidth = self.occGrid.shape
+        with open(fileName, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, mapHeight, mapWidth, len(events), self.pathCost))
+            file.write(np.packbits(self.occGrid).tobytes())
+            file.write(events.tobytes())
+
+## ------------------------------------------------------------------------------------------
+#                                     Search Trace Class
+## ------------------------------------------------------------------------------------------
+
+class SearchTrace:
+
+    '''
+    Attributes:
+        occGrid: map the search ran on
+        events: memory mapped array of (kind, cell, cost) in search order
+        pathCost: cost of the path found, inf if the goal could not be reached
+    '''
+
+    def __init__(self, occGrid, events, pathCost):
+        self.occGrid = occGrid
+        self.events = events
+        self.pathCost = pathCost
+
+    def __repr__(self):
+        counts = np.bincount(self.events['kind'], minlength = 3)
+        return(f' expansions: {counts[EXPAND]}, pushes: {counts[RELAX]}, path cells: {counts[PATH]}, cost: {self.pathCost} ')
+
+    def __len__(self):
+        return(len(self.events))
+
+    def getPath(self): # path as a list of [x, y], start to goal
+        cells = self.events['cell'][self.events['kind'] == PATH]
+        return([toState(int(cell), self.occGrid.shape[1]) for cell in cells])
+
+def loadTrace(fileName):
+    with open(fileName, 'rb') as file:
+        magic, version, mapHeight, mapWidth, numEvents, pathCost = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{fileName} is not a version {VERSION} search trace")
+        mapBytes = (mapHeight * mapWidth + 7) // 8
+        occGrid = np.unpackbits(np.frombuffer(file.read(mapBytes), dtype = np.uint8), count = mapHeight * mapWidth)
+    occGrid = occGrid.astype(bool).reshape(mapHeight, mapWidth)
+    events = np.memmap(fileName, dtype = EVENT_DTYPE, mode = 'r', offset = HEADER.size + mapBytes, shape = (numEvents,)) if numEvents else np.empty(0, dtype = EVENT_DTYPE)
+    return(SearchTrace(occGrid, events, pathCost))
+
+## ------------------------------------------------------------------------------------------
+#                                     Trace Replay Class
+## ------------------------------------------------------------------------------------------
+
+class TraceReplay:
+
+    '''
+    Draws a SearchTrace in a Dijk_visualizer.SearchVisualizer.
+    step is the number of events drawn so far, seek(step) jumps anywhere, play() runs forward.
+    '''
+
+    def __init__(self, trace, cellSize = 4, maxFps = 30, frameDir = None, headless = False, showRelaxations = True):
+        from Dijk_visualizer import SearchVisualizer   # imported here so loading a trace never needs pygame
+        self.trace = trace
+        self.view = SearchVisualizer(trace.occGrid, cellSize, maxFps, None, frameDir, headless)
+        self.showRelaxations = showRelaxations
+        self.mapWidth = trace.occGrid.shape[1]
+        self.path = trace.getPath()
+        self.pathStart = len(trace) - len(self.path)   # path events come last
+        self.step = 0
+
+    def seek(self, step): # show the search as it was after step events, going back redraws from the bare map
+        step = max(0, min(step, len(self.trace)))
+        if step < self.step:
+            self.view.reset()
+            self.step = 0
+        self.drawEvents(self.step, step)
+        self.step = step
+        self.view.dirty = [self.view.screen.get_rect()]   # one full update instead of a rectangle per event
+        self.view.drawFrame()
+
+    def play(self, speed = None, stop = None): # events per second, None for as fast as drawing allows
+        stop = len(self.trace) if stop is None else min(stop, len(self.trace))
+        begin, first = time.perf_counter(), self.step
+        while self.step < stop:
+            self.drawEvents(self.step, self.step + 1)
+            self.step += 1
+            if speed is not None:
+                ahead = (self.step - first) / speed - (time.perf_counter() - begin)
+                if ahead > 0:
+                    time.sleep(ahead)
+        self.view.drawFrame()
+
+    def drawEvents(self, first, last):
+        events = self.trace.events[first:min(last, self.pathStart)]
+        for kind, cell in zip(events['kind'].tolist(), events['cell'].tolist()):
+            state = toState(cell, self.mapWidth)
+            if kind == EXPAND:
+                self.view.observe(state)   # draws the cell, takes a frame when one is due
+            elif self.showRelaxations:
+                self.view.drawCell(state, RELAXED_COLOUR)
+        if last > self.pathStart:          # draw as much of the path as has been reached
+            self.view.drawPath(self.path[:last - self.pathStart], self.path[0], self.path[-1])
+
+## ------------------------------------------------------------------------------------------
+#                                       Main Function
+## ------------------------------------------------------------------------------------------
+
+if __name__== "__main__":
+
+    parser = argparse.ArgumentParser(description = "Replay a recorded search trace")
+    parser.add_argument('trace', help = "file written by TraceRecorder.save")
+    parser.add_argument('--speed', type = float, help = "events per second, as fast as possible when left out")
+    parser.add_argument('--start', type = int, default = 0, help = "event to jump to before playing")
+    parser.add_argument('--stop', type = int, help = "event to stop at")
+    parser.add_argument('--cellSize', type = int, default = 4)
+    parser.add_argument('--maxFps', type = float, default = 30)
+    parser.add_argument('--headless', action = 'store_true', help = "SDL dummy driver, use with --frames")
+    parser.add_argument('--frames', help = "directory to save every frame as PNG")
+    args = parser.parse_args()
+
+    trace = loadTrace(args.trace)
+    print(trace)
+    replay = TraceReplay(trace, args.cellSize, args.maxFps, args.frames, args.headless)
+    replay.seek(args.start)
+    replay.play(args.speed, args.stop)
+    if not args.headless:
+        time.sleep(2)
+    replay.view.close()
@@ -0,0 +1,135 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Search Visualizer]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: draw a search on any occupancy grid without slowing it down, the static map is drawn once
+        to a cached background and each frame only updates the cells explored since the last one
+
+--> frames are capped at maxFps of wall time, or taken every nodesPerFrame explored cells when set,
+    so the search runs at full speed and the frame count does not depend on how fast it is
+--> headless = True uses the SDL dummy driver, frames can still be written as PNG files for CI,
+    e.g. ffmpeg -i frames/frame_%06d.png search.mp4 turns them into a video
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import numpy as np
+
+# colours
+BACKGROUND_COLOUR = (30, 30, 30)
+OBSTACLE_COLOUR = (80, 80, 80)
+EXPLORED_COLOUR = (255, 255, 255)
+PATH_COLOUR = (255, 255, 0)
+START_COLOUR = (255, 0, 0)
+GOAL_COLOUR = (0, 128, 0)
+
+## ------------------------------------------------------------------------------------------
+#                                     Visualizer Class
+## ------------------------------------------------------------------------------------------
+
+class SearchVisualizer:
+
+    '''
+    Attributes:
+        occGrid: map being drawn, cell (x, y) is drawn with y pointing up like the map scripts
+        cellSize: pixels per cell side
+        maxFps: most frames drawn per second of wall time
+        nodesPerFrame: when set, a frame is drawn every nodesPerFrame explored cells instead
+        frameDir: when set, every frame is saved there as frame_000000.png, frame_000001.png, ...
+        framesDrawn: number of frames drawn so far
+    '''
+
+    def __init__(self, occGrid, cellSize = 4, maxFps = 30, nodesPerFrame = None, frameDir = None, headless = False):
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'   # must be set before pygame starts the display
+        import pygame                                 # imported here so the search modules never need pygame
+        self.pygame = pygame
+
+        self.occGrid = np.asarray(occGrid, dtype = bool)
+        self.mapHeight, self.mapWidth = self.occGrid.shape
+        self.cellSize = cellSize
+        self.maxFps = maxFps
+        self.nodesPerFrame = nodesPerFrame
+        self.frameDir = frameDir
+        self.framesDrawn = 0
+        if frameDir is not None:
+            os.makedirs(frameDir, exist_ok = True)
+
+        pygame.init()
+        self.screen = pygame.display.set_mode((self.mapWidth * cellSize, self.mapHeight * cellSize))
+        self.background = self.drawBackground()
+        self.screen.blit(self.background, (0, 0))
+        self.dirty = [self.screen.get_rect()]   # rectangles changed since the last frame
+        self.nodesSinceFrame = 0
+        self.lastFrame = 0.0
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Drawing Functions
+    ## --------------------------------------------------------------------------------------
+
+    def drawBackground(self): # static map as one surface, built from the grid in a single array operation
+        colours = np.where(self.occGrid[::-1, :, None], OBSTACLE_COLOUR, BACKGROUND_COLOUR).astype(np.uint8)
+        pixels = colours.repeat(self.cellSize, axis = 0).repeat(self.cellSize, axis = 1)
+        return(self.pygame.surfarray.make_surface(pixels.transpose(1, 0, 2)))   # surfarray is indexed [x, y]
+
+    def observe(self, state): # observer for findPath --> mark the cell explored, draw a frame when one is due
+        self.drawCell(state, EXPLORED_COLOUR)
+        self.nodesSinceFrame += 1
+        if self.nodesPerFrame is not None:
+            if self.nodesSinceFrame >= self.nodesPerFrame:
+                self.drawFrame()
+        elif time.perf_counter() - self.lastFrame >= 1 / self.maxFps:
+            self.drawFrame()
+
+    def drawPath(self, path, s = None, g = None): # final path plus start and goal markers, always drawn
+        pygame = self.pygame
+        points = [self.cellCentre(state) for state in path]
+        if len(points) > 1:
+            self.dirty.append(pygame.draw.lines(self.screen, PATH_COLOUR, False, points, max(1, self.cellSize // 3)))
+        radius = max(4, self.cellSize // 3)   # marker stays visible on small cells without covering the neighbours of large ones
+        if s is not None:
+            self.dirty.append(pygame.draw.circle(self.screen, START_COLOUR, self.cellCentre(s), radius))
+        if g is not None:
+            self.dirty.append(pygame.draw.circle(self.screen, GOAL_COLOUR, self.cellCentre(g), radius))
+        self.drawFrame()
+
+    def drawFrame(self): # push the dirty rectangles to the display, save the frame when asked to
+        pygame = self.pygame
+        pygame.display.update(self.dirty)
+        self.dirty = []
+        self.nodesSinceFrame = 0
+        self.lastFrame = time.perf_counter()
+        if self.frameDir is not None:
+            pygame.image.save(self.screen, os.path.join(self.frameDir, f"frame_{self.framesDrawn:06d}.png"))
+        self.framesDrawn += 1
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+    def reset(self): # back to the bare map, e.g. before drawing another search
+        self.screen.blit(self.background, (0, 0))
+        self.dirty = [self.screen.get_rect()]
+        self.nodesSinceFrame = 0
+
+    def close(self):
+        self.pygame.quit()
+
+    ## --------------------------------------------------------------------------------------
+    #                                  Helper Functions
+    ## --------------------------------------------------------------------------------------
+
+    def drawCell(self, state, colour):
+        rect = self.pygame.Rect((state[0] - 1) * self.cellSize, (self.mapHeight - state[1]) * self.cellSize, self.cellSize, self.cellSize)
+        self.dirty.append(self.screen.fill(colour, rect))
+
+    def cellCentre(self, state): # pixel centre of cell [x, y]
+        return(((state[0] - 1) * self.cellSize + self.cellSize // 2, (self.mapHeight - state[1]) * self.cellSize + self.cellSize // 2))
@@ -0,0 +1,79 @@
+## ------------------------------------------------------------------------------------------
+#                                  Dijkstra [Wavefront Distances]
+## ------------------------------------------------------------------------------------------
+
+'''
+Author: Jai Sharma
+Task: compute the cost from a source to every cell of the map with whole array NumPy operations
+        instead of one Python loop step per node, for full map distance transforms on large grids
+
+--> frontier synchronous relaxation: every round settles all open cells whose cost is below the lowest
+    open cost + the cheapest step, none of them can still get cheaper, then relaxes their moves together
+--> every cell is settled once and only the open frontier is touched each round, so a round costs
+    O(frontier) and not O(map)
+--> costs are counted in 1 / COST_SCALE units (10 straight, 14 diagonal), sums carry no floating point drift
+'''
+
+## ------------------------------------------------------------------------------------------
+#                                        Import Libraries
+## ------------------------------------------------------------------------------------------
+
+import numpy as np
+from Dijk_search import COST_SCALE, buildMoveMasks, buildMoveTable, checkState, toCellId
+
+## ------------------------------------------------------------------------------------------
+#                                     Wavefront Function
+## ------------------------------------------------------------------------------------------
+
+def wavefrontDistances(occGrid, sources, connectivity = 8, moveMasks = None):
+
+    '''
+    Cost from the nearest state in sources to every cell of occGrid.
+    Returns a float array (mapHeight, mapWidth), inf for obstacles and unreachable cells.
+    Same costs as Dijk_search.fullSearch, without the floating point drift of summing 1.4 steps.
+    '''
+
+    mapHeight, mapWidth = occGrid.shape
+    numCells = mapHeight * mapWidth
+    if moveMasks is None:
+        moveMasks = buildMoveMasks(occGrid, connectivity)
+    legalMoves = moveMasks.reshape(-1)
+    moveTable = [(bit, delta, round(step * COST_SCALE)) for bit, delta, step in buildMoveTable(mapWidth, connectivity)]
+
+    unreached = np.iinfo(np.int64).max
+    cost = np.full(numCells, unreached, dtype = np.int64)
+    for state in sources:
+        checkState(state, occGrid, "Source")
+    frontier = np.unique(np.array([toCellId(state, mapWidth) for state in sources], dtype = np.int64))
+    cost[frontier] = 0
+    bandWidth = min(step for _, _, step in moveTable)
+    isOpen = np.zeros(numCells, dtype = bool)      # True for cells in frontier
+    isOpen[frontier] = True
+    stamp = np.zeros(numCells, dtype = np.int64)   # scratch array to drop repeated children without sorting
+
+    while frontier.size > 0:
+        openCost = cost[frontier]
+        inBand = openCost < openCost.min() + bandWidth
+        band, frontier = frontier[inBand], frontier[~inBand]
+        isOpen[band] = False
+        frontierMoves, frontierCost = legalMoves[band], openCost[inBand]
+        children, childCosts = [], []
+        for bit, delta, step in moveTable:   # one shifted view of the frontier per move
+            legal = (frontierMoves & bit) != 0
+            child = band[legal] + delta
+            childCost = frontierCost[legal] + step
+            better = childCost < cost[child]
+            children.append(child[better])
+            childCosts.append(childCost[better])
+        child, childCost = np.concatenate(children), np.concatenate(childCosts)
+        np.minimum.at(cost, child, childCost)
+
+        # cells whose cost dropped join the open frontier once --> keep the last copy of each new child
+        child = child[~isOpen[child]]
+        stamp[child] = np.arange(child.size)
+        child = child[stamp[child] == np.arange(child.size)]
+        isOpen[child] = True
+        frontier = np.concatenate((frontier, child))
+
+    distances = np.where(cost == unreached, np.inf, cost / COST_SCALE)
+    return(distances.reshape(mapHeight, mapWidth))